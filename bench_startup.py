@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+r"""
+启动耗时基准：两个工具的“导入阶段”耗时 + -X importtime 明细。
+
+用法：
+  python bench_startup.py              # 每个脚本跑 5 次，取中位数
+  python bench_startup.py -n 10 --budget-ms 800
+  python bench_startup.py --window     # 额外测量到窗口首帧（需要图形环境）
+
+以下任一情况退出码为 1，可直接挂到 CI / 发版前检查：
+  · 导入阶段加载了重模块（pandas / PIL / pytesseract / PyPDF2 / pikepdf / psutil / numpy）
+  · 导入阶段中位耗时超过 --budget-ms
+"""
+
+import argparse, re, subprocess, sys, statistics
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SCRIPTS = {
+    "合并移动工具": ("结论性文书合并移动工具V3.3.12.py", "root = tk.Tk(); m['App'](root)"),
+    "改名工具":     ("公安改名工具_v8.1.6_macfix.py",     "root = m['App']()"),
+}
+HEAVY = ("pandas", "PIL", "pytesseract", "PyPDF2", "pikepdf", "psutil", "numpy")
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def _snippet(path: Path, window_code: str | None) -> str:
+    code = (
+        "import time, tkinter as tk, runpy\n"
+        "t0 = time.perf_counter()\n"
+        f"m = runpy.run_path({str(path)!r}, run_name='__bench__')\n"
+        "t1 = time.perf_counter()\n"
+    )
+    if window_code:
+        code += f"{window_code}; root.update()\nt2 = time.perf_counter(); root.destroy()\n"
+    else:
+        code += "t2 = t1\n"
+    return code + "print(f'BENCH {t1 - t0:.6f} {t2 - t0:.6f}')\n"
+
+def run_once(path: Path, window_code: str | None):
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _snippet(path, window_code)],
+        capture_output=True, text=True, encoding="utf-8", errors="replace", cwd=str(HERE),
+    )
+    m = re.search(r"BENCH (\S+) (\S+)", r.stdout)
+    if r.returncode != 0 or not m:
+        raise RuntimeError(f"{path.name} 运行失败：\n{r.stderr[-2000:]}")
+    # 只统计 runpy 之后（即脚本自身触发）的导入
+    lines = r.stderr.splitlines()
+    start = next((i for i, ln in enumerate(lines) if ln.rstrip().endswith("| runpy")), 0)
+    imports = []
+    for ln in lines[start + 1:]:
+        mm = IMPORTTIME_RE.match(ln)
+        if mm:
+            imports.append((int(mm.group(2)), len(mm.group(3)), mm.group(4)))
+    return float(m.group(1)), float(m.group(2)), imports
+
+def main():
+    ap = argparse.ArgumentParser(description="两个工具的启动耗时基准")
+    ap.add_argument("-n", type=int, default=5, help="每个脚本重复次数")
+    ap.add_argument("--budget-ms", type=float, default=1500, help="导入阶段中位耗时上限（毫秒）")
+    ap.add_argument("--top", type=int, default=10, help="显示最慢的前 N 个顶层导入")
+    ap.add_argument("--window", action="store_true", help="同时测量到窗口首帧的耗时")
+    args = ap.parse_args()
+
+    failed = False
+    for label, (fname, window_code) in SCRIPTS.items():
+        path = HERE / fname
+        loads, firsts, imports = [], [], []
+        for _ in range(max(1, args.n)):
+            t_load, t_first, imports = run_once(path, window_code if args.window else None)
+            loads.append(t_load * 1000); firsts.append(t_first * 1000)
+        med = statistics.median(loads)
+        print(f"=== {label}（{fname}）===")
+        print(f"导入阶段：中位 {med:.1f}ms（最小 {min(loads):.1f} / 最大 {max(loads):.1f}）")
+        if args.window:
+            print(f"到窗口首帧：中位 {statistics.median(firsts):.1f}ms")
+
+        top_level = [x for x in imports if x[1] <= 1]
+        for cum_us, _, name in sorted(top_level, reverse=True)[:args.top]:
+            print(f"  {cum_us / 1000:8.1f}ms  {name}")
+
+        heavy = sorted({name.split(".")[0] for _, _, name in imports} & set(HEAVY))
+        if heavy:
+            failed = True
+            print(f"!!! 导入阶段加载了重模块：{', '.join(heavy)}")
+        if med > args.budget_ms:
+            failed = True
+            print(f"!!! 导入阶段超出预算：{med:.1f}ms > {args.budget_ms:.0f}ms")
+        print()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
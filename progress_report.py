@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# progress_report.py
+#
+# 两个工具共用的进度汇总（改名工具 / 结论性文书合并移动工具）。
+# PyInstaller 打包时随脚本的 import 自动收入，无需额外参数。
+
+import threading, time
+import tkinter as tk
+
+PROGRESS_UI_MS      = 250         # 进度刷新间隔（毫秒）
+PROGRESS_EMA_ALPHA  = 0.3         # 速率平滑系数
+
+
+class ProgressReporter:
+    """
+    进度汇总：工作线程只调用 start / volume_started / page_done / volume_done / finish
+    （加锁累加计数，不碰界面）；前端按固定频率取 snapshot() 合并刷新。
+    前端可用 bind_tk(widget, render) 在 Tk 主线程定时刷新，或自行定时调用 snapshot()。
+    """
+    def __init__(self, alpha: float = PROGRESS_EMA_ALPHA):
+        self._lock = threading.Lock()
+        self._alpha = alpha
+        self.start(0)
+        self.running = False
+
+    # ---- 工作线程侧 ----
+    def start(self, volumes_total: int, pages_total: int = 0):
+        with self._lock:
+            self.volumes_total, self.volumes_done = volumes_total, 0
+            self.pages_total, self.pages_done, self.bytes_done = pages_total, 0, 0
+            self.item_total = self.item_done = 0
+            self.running = True
+            self._t0 = self._last_t = time.monotonic()
+            self._last_pages = self._last_bytes = 0
+            self._pps = self._bps = None
+
+    def volume_started(self, pages: int):
+        with self._lock:
+            self.item_total, self.item_done = pages, 0
+
+    def page_done(self, nbytes: int = 0):
+        with self._lock:
+            self.item_done += 1; self.pages_done += 1; self.bytes_done += nbytes
+
+    def volume_done(self):
+        with self._lock:
+            self.volumes_done += 1
+
+    def finish(self):
+        with self._lock:
+            self.running = False
+
+    # ---- 前端侧 ----
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            dt = now - self._last_t
+            if dt >= 0.2:
+                pps = (self.pages_done - self._last_pages) / dt
+                bps = (self.bytes_done - self._last_bytes) / dt
+                self._pps = pps if self._pps is None else (1 - self._alpha) * self._pps + self._alpha * pps
+                self._bps = bps if self._bps is None else (1 - self._alpha) * self._bps + self._alpha * bps
+                self._last_t, self._last_pages, self._last_bytes = now, self.pages_done, self.bytes_done
+            if self.pages_total:
+                remaining = max(self.pages_total - self.pages_done, 0)
+            elif self.volumes_done:
+                # 总页数未知：按已完成卷的平均页数外推剩余卷
+                per_vol = self.pages_done / max(self.volumes_done, 1)
+                in_flight = self.item_done if self.item_done < self.item_total else 0
+                remaining = max((self.volumes_total - self.volumes_done) * per_vol - in_flight, 0)
+            else:
+                remaining = None
+            eta = (remaining / self._pps) if (remaining is not None and self._pps) else None
+            return {
+                "volumes_done": self.volumes_done, "volumes_total": self.volumes_total,
+                "item_done": self.item_done, "item_total": self.item_total,
+                "pages_done": self.pages_done, "elapsed": now - self._t0,
+                "pages_per_s": self._pps or 0.0, "mb_per_s": (self._bps or 0.0) / 2**20,
+                "eta": eta, "running": self.running,
+            }
+
+    @staticmethod
+    def describe(snap: dict) -> str:
+        eta = snap["eta"]
+        eta_txt = ("—" if eta is None else
+                   f"{int(eta) // 3600}:{int(eta) % 3600 // 60:02d}:{int(eta) % 60:02d}")
+        return f"{snap['pages_per_s']:.1f} 页/s · {snap['mb_per_s']:.1f} MB/s · 剩余约 {eta_txt}"
+
+    def bind_tk(self, widget, render, interval_ms: int = PROGRESS_UI_MS):
+        """在 Tk 主线程按固定间隔刷新；任务结束后再渲染一次即停止。"""
+        def tick():
+            snap = self.snapshot()
+            try:
+                render(snap)
+            except tk.TclError:
+                return
+            if snap["running"]:
+                widget.after(interval_ms, tick)
+        widget.after(interval_ms, tick)
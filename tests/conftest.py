@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # 两个脚本都从同目录导入 progress_report
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, ROOT / filename)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture
+def merge_tool(tmp_path, monkeypatch):
+    """合并移动工具模块；日志目录（norm_cache / perf_stats 所在）指向临时目录。"""
+    mod = _load("merge_tool", "结论性文书合并移动工具V3.3.12.py")
+    monkeypatch.setattr(mod, "_log_dir", lambda: tmp_path / "OCR_Logs")
+    (tmp_path / "OCR_Logs").mkdir()
+    return mod
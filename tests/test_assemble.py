@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+Name, Dictionary = pikepdf.Name, pikepdf.Dictionary
+
+
+def _page_pdf(path, fonts):
+    """单页 PDF，fonts: {资源名: BaseFont}；每个字体都是独立的间接对象（含嵌入字体流）。"""
+    with pikepdf.new() as pdf:
+        res = Dictionary()
+        for res_name, base in fonts.items():
+            data = pdf.make_stream(f"glyphs of {base}".encode())
+            desc = pdf.make_indirect(Dictionary(Type=Name.FontDescriptor, FontName=Name("/" + base), FontFile2=data))
+            res[res_name] = pdf.make_indirect(Dictionary(
+                Type=Name.Font, Subtype=Name.TrueType, BaseFont=Name("/" + base), FontDescriptor=desc))
+        page = Dictionary(Type=Name.Page, MediaBox=[0, 0, 200, 200], Resources=Dictionary(Font=res),
+                          Contents=pdf.make_stream(b"BT /F1 12 Tf (Hi) Tj ET"))
+        pdf.pages.append(pikepdf.Page(page))
+        pdf.save(path)
+    return str(path)
+
+
+def _font_names(path):
+    with pikepdf.open(path) as pdf:
+        return sorted(str(o.BaseFont) for o in pdf.objects
+                      if isinstance(o, Dictionary) and o.get("/Type") == Name.Font), len(pdf.pages)
+
+
+@pytest.mark.parametrize("linearize", [False, True])
+def test_assemble_pdf_shares_identical_fonts(merge_tool, tmp_path, linearize):
+    parts = [_page_pdf(tmp_path / f"p{i}.pdf", {"/F1": "GlyphLessFont"}) for i in range(3)]
+    parts.append(_page_pdf(tmp_path / "p3.pdf", {"/F1": "GlyphLessFont", "/F2": "Courier"}))
+    out = tmp_path / "vol.pdf"
+
+    info = merge_tool.assemble_pdf(parts, out, linearize=linearize)
+
+    assert info["engine"] == "pikepdf" and info["pages"] == 4
+    assert info["merged"] == 3                      # 后三页的 GlyphLessFont 指向第一页那份
+    assert _font_names(out) == (["/Courier", "/GlyphLessFont"], 4)
+    with pikepdf.open(out) as pdf:
+        assert pdf.is_linearized == linearize
+        fonts = {p.Resources.Font.F1.objgen for p in pdf.pages}
+        assert len(fonts) == 1
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import ctypes
+
+import pytest
+
+
+@pytest.fixture
+def gov(merge_tool, monkeypatch):
+    samples = {"cpu": 50.0, "mem": 8 * 2**30}
+    monkeypatch.setattr(merge_tool, "_sample_cpu_percent", lambda: samples["cpu"])
+    monkeypatch.setattr(merge_tool, "_sample_memory_available", lambda: samples["mem"])
+    logged = []
+    g = merge_tool.ResourceGovernor(log=logged.append, limits={"ocr": (1, 8), "copy": (1, 8)})
+    g.cur = {"ocr": 4, "copy": 4}
+
+    def tick(**kw):
+        samples.update(kw)
+        g._next_tick = 0
+        with g._cond:
+            msgs = g._tick_locked()
+        g._emit(msgs)
+        return msgs
+    g.tick, g.logged = tick, logged
+    return g
+
+
+def test_high_cpu_or_low_memory_lowers_ocr(gov):
+    assert gov.tick(cpu=95.0) == ["⚙ 并发调整：OCR 4→3（CPU 95%，可用内存 8.0GB）"]
+    gov.tick(cpu=20.0, mem=1 * 2**30)
+    assert gov.cur["ocr"] == 2 and gov.logged[-1].startswith("⚙ 并发调整：OCR 3→2")
+
+
+def test_ocr_grows_only_when_idle_and_saturated(gov):
+    assert gov.tick(cpu=30.0) == [] and gov.cur["ocr"] == 4     # 名额没用满：不升
+    gov.active["ocr"] = 4
+    assert gov.tick(cpu=30.0) == ["⚙ 并发调整：OCR 4→5（CPU 30%，可用内存 8.0GB）"]
+    gov.active["ocr"] = 8; gov.cur["ocr"] = 8
+    assert gov.tick(cpu=10.0) == []                              # 已到上限
+
+
+def test_slow_copies_lower_copy_workers(gov):
+    gov.observe_io(2.0, 2**20)
+    msgs = gov.tick()
+    assert gov.cur["copy"] == 3 and msgs[0].startswith("⚙ 并发调整：复制 4→3（I/O 2000ms/文件")
+    assert gov.logged == msgs
+
+
+def test_cpu_sampler_falls_back_to_get_system_times(merge_tool, monkeypatch):
+    readings = iter([(100, 200, 100), (150, 300, 200)])     # 空闲 / 内核（含空闲）/ 用户
+
+    class Kernel32:
+        @staticmethod
+        def GetSystemTimes(idle, kernel, user):
+            i, k, u = next(readings)
+            idle._obj.value, kernel._obj.value, user._obj.value = i, k, u
+            return 1
+    monkeypatch.setattr(merge_tool, "_psutil", lambda: None)
+    monkeypatch.setattr(merge_tool.sys, "platform", "win32")
+    monkeypatch.setattr(ctypes, "windll", type("windll", (), {"kernel32": Kernel32}), raising=False)
+    monkeypatch.setattr(merge_tool, "_cpu_times_prev", {})
+    assert merge_tool._sample_cpu_percent() is None             # 首次只建立基线
+    assert merge_tool._sample_cpu_percent() == 75.0             # 空闲 50 / 总 200
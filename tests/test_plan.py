@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _volume(root, danghao, names):
+    d = root / danghao
+    d.mkdir(parents=True)
+    for n in names:
+        if n.endswith(".tif"):
+            frames = [Image.new("L", (8, 8), v) for v in (10, 20, 30)]
+            frames[0].save(d / n, save_all=True, append_images=frames[1:])
+        elif n.endswith(".png"):
+            Image.new("RGB", (8, 8), "white").save(d / n)
+        else:
+            (d / n).write_bytes(b"\xff\xd8" + b"x" * 98)
+    return d
+
+
+def _excel(path, rows):
+    pd.DataFrame(rows, columns=["档号", "结论文书的页码范围"]).to_excel(path, index=False)
+    return str(path)
+
+
+def test_scan_folder_pages_expands_frames_in_natural_order(merge_tool, tmp_path):
+    d = _volume(tmp_path / "img", "A1", ["10.jpg", "2.tif", "1.jpg", "3.png"])
+    refs = merge_tool.scan_folder_pages(str(d))
+    assert [(r[0].rsplit("/", 1)[-1], r[1], r[2]) for r in refs] == [
+        ("1.jpg", None, None),
+        ("2.tif", 0, "2_p0001.jpg"), ("2.tif", 1, "2_p0002.jpg"), ("2.tif", 2, "2_p0003.jpg"),
+        ("3.png", 0, "3.jpg"),
+        ("10.jpg", None, None),
+    ]
+
+
+def test_plan_workload_counts_pending_work(merge_tool, tmp_path):
+    img = tmp_path / "img"
+    _volume(img, "A1", ["1.jpg", "2.jpg", "3.tif"])
+    _volume(img, "A2", ["1.jpg", "2.jpg"])
+    pdf_out, copy_out = tmp_path / "pdf", tmp_path / "copy"
+    (pdf_out / "A2").mkdir(parents=True)
+    (pdf_out / "A2" / "A2.pdf").write_bytes(b"%PDF")
+    (copy_out / "A1").mkdir(parents=True)
+    (copy_out / "A1" / "1.jpg").write_bytes(b"x")
+    excel = _excel(tmp_path / "t.xlsx", [["A1", "1-4"], ["A2", "2"], ["A3", "1"], ["A4", ""]])
+
+    plan = merge_tool.plan_workload(excel, str(img), str(pdf_out), str(copy_out))
+
+    assert plan["volumes"] == 4
+    assert plan["problems"] == 2            # A3 无目录，A4 页码为空
+    assert plan["pages"] == 5
+    assert plan["norm_pages"] == 2          # 3.tif 的两帧被选中
+    assert plan["copy_done"] == 1 and plan["copy_files"] == 4
+    assert plan["pdf_done"] == 1
+    assert plan["ocr_volumes"] == 1 and plan["ocr_pages"] == 4
+
+
+def test_plan_workload_reads_each_tiff_header_once(merge_tool, tmp_path, monkeypatch):
+    d = _volume(tmp_path / "img", "A1", ["1.tif"])
+    calls = []
+    real = merge_tool._image_frames
+    monkeypatch.setattr(merge_tool, "_image_frames", lambda p: calls.append(p) or real(p))
+    excel = _excel(tmp_path / "t.xlsx", [["A1", "1-3"]])
+    plan = merge_tool.plan_workload(excel, str(tmp_path / "img"))
+    assert len(calls) == 1
+    assert plan["copy_files"] == 3
+    assert plan["copy_bytes"] == (d / "1.tif").stat().st_size // 3 * 3
+
+
+def test_plan_workload_without_output_dirs(merge_tool, tmp_path):
+    _volume(tmp_path / "img", "A1", ["1.jpg", "2.jpg"])
+    excel = _excel(tmp_path / "t.xlsx", [["A1", "1,2"]])
+    plan = merge_tool.plan_workload(excel, str(tmp_path / "img"))
+    assert plan["ocr_pages"] == 2 and plan["copy_files"] == 2 and plan["pdf_done"] == 0
+
+
+def test_transcode_scales_16bit_frames(merge_tool, tmp_path):
+    src = tmp_path / "deep.tif"
+    im = Image.new("I;16", (4, 1))
+    im.putdata([0, 16384, 32768, 65535])
+    im.save(src)
+    out = tmp_path / "deep.jpg"
+    merge_tool._transcode_frames(str(src), [(0, str(out))], 95, None)
+    with Image.open(out) as got:
+        vals = [got.convert("L").getpixel((x, 0)) for x in range(4)]
+    assert vals[0] < 10 and 50 < vals[1] < 80 and 115 < vals[2] < 140 and vals[3] > 245
+
+
+def test_prune_norm_cache_drops_stale_then_oldest(merge_tool, tmp_path):
+    import os, time
+    root = tmp_path / "OCR_Logs" / merge_tool.NORM_CACHE_NAME
+    now = time.time()
+    for name, age_days in (("stale", 40), ("old", 10), ("new", 1)):
+        d = root / name
+        d.mkdir(parents=True)
+        (d / "p.jpg").write_bytes(b"x" * 2**20)
+        os.utime(d, (now - age_days * 86400,) * 2)
+
+    assert merge_tool.prune_norm_cache(max_days=30, max_mb=10) == (1, 2**20)
+    assert sorted(p.name for p in root.iterdir()) == ["new", "old"]
+    assert merge_tool.prune_norm_cache(max_days=30, max_mb=1) == (1, 2**20)
+    assert [p.name for p in root.iterdir()] == ["new"]
+
+
+def test_folder_index_notices_tiff_rewritten_in_place(merge_tool, tmp_path):
+    import os
+    d = _volume(tmp_path / "img", "A1", ["1.tif"])
+    index = merge_tool.FolderIndex()
+    assert len(index.pages(str(d))) == 3
+    st = os.stat(d)
+    frames = [Image.new("L", (8, 8), v) for v in range(5)]
+    frames[0].save(d / "1.tif", save_all=True, append_images=frames[1:])
+    os.utime(d, ns=(st.st_atime_ns, st.st_mtime_ns))       # 目录 mtime 不变
+    assert len(index.pages(str(d))) == 5
+
+
+def test_record_perf_stats_keeps_concurrent_updates(merge_tool):
+    import threading
+    perf = {"norm_secs": 0.0, "norm_pages": 0, "copy_secs": 0.0, "copy_bytes": 0,
+            "ocr_secs": 6.0, "ocr_pages": 3, "asm_secs": 0.0, "asm_pages": 0}
+    threads = [threading.Thread(target=merge_tool.record_perf_stats, args=(perf,)) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    stats = merge_tool.load_perf_stats()
+    assert stats["runs"] == 8 and stats["ocr_sec_per_page"] == pytest.approx(2.0)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from progress_report import ProgressReporter
+
+
+def test_snapshot_counts_and_eta(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("progress_report.time.monotonic", lambda: clock[0])
+    rep = ProgressReporter()
+    rep.start(2, pages_total=4)
+    rep.volume_started(2)
+    rep.page_done(2**20); rep.page_done(2**20)
+    rep.volume_done()
+    clock[0] += 1.0
+    snap = rep.snapshot()
+    assert (snap["volumes_done"], snap["item_done"], snap["pages_done"]) == (1, 2, 2)
+    assert snap["pages_per_s"] == 2.0 and snap["mb_per_s"] == 2.0
+    assert snap["eta"] == 1.0               # 剩 2 页，2 页/s
+    assert snap["running"]
+    rep.finish()
+    assert not rep.snapshot()["running"]
+
+
+def test_eta_extrapolates_when_page_total_unknown(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("progress_report.time.monotonic", lambda: clock[0])
+    rep = ProgressReporter()
+    rep.start(4)
+    rep.volume_started(3)
+    for _ in range(3): rep.page_done()
+    rep.volume_done()
+    clock[0] += 3.0
+    assert rep.snapshot()["eta"] == 9.0     # 剩 3 卷 × 每卷 3 页，1 页/s
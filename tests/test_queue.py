@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import threading
+
+
+def test_queue_tolerates_removed_job(merge_tool, tmp_path):
+    q = merge_tool.JobQueue(tmp_path / "q.json")
+    a, b = q.add(excel="a.xlsx"), q.add(excel="b.xlsx")
+    assert q.take_next()["id"] == a["id"]
+    q.remove(a["id"])                       # 运行中的不删
+    q.remove(b["id"])
+    assert [j["id"] for j in q.snapshot()] == [a["id"]]
+
+    q.set_status(b["id"], "完成")           # 已删除的任务：静默忽略
+    q.move(b["id"], -1)
+    assert q.get(b["id"]) is None
+    assert merge_tool.JobQueue(tmp_path / "q.json").jobs[0]["status"] == "等待"   # 重启后恢复
+
+
+def test_remove_job_refuses_started_job_even_when_paused(merge_tool, tmp_path):
+    app = object.__new__(merge_tool.App)
+    app.queue = merge_tool.JobQueue(tmp_path / "q.json")
+    app._queue_cond = threading.Condition()
+    app._running, logged = {}, []
+    app._log = logged.append
+    job = app.queue.add(excel="a.xlsx")
+    app.queue.take_next()
+    app._running[job["id"]] = ({"resume": threading.Event()}, None)
+    app.queue.set_status(job["id"], "暂停")
+
+    app.remove_job(job["id"])
+    assert app.queue.get(job["id"])["status"] == "暂停" and logged
+
+    app._running.clear()
+    app.remove_job(job["id"])
+    assert app.queue.get(job["id"]) is None
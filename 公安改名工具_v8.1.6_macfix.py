@@ -4,6 +4,7 @@ r"""
 更新要点：
   · 基本设置区：采用 Entry 可拉伸 + 弹性占位列 + 右侧按钮，消除右侧大空白
   · 运行日志：白底深色字 + 细边框，视觉更协调
+  · 进度：ProgressReporter 汇总阶段/页事件，界面定时合并刷新并显示速率与剩余时间
 其余沿用 v8.1.4：
   · D列(页数) ↔ J列(正文范围) 一致性=错误
   · K列(备考表的图像位置) = 文件夹图像总数=错误
@@ -22,6 +23,8 @@ import traceback
 from datetime import datetime
 from collections import defaultdict
 
+from progress_report import ProgressReporter
+
 # ----------------- 资源路径 -----------------
 def resource_path(rel):
     """PyInstaller 单文件模式下的资源定位"""
@@ -53,11 +56,7 @@ BASE_DIR  = str(_get_base_dir())
 REPORT_DIR = os.path.join(BASE_DIR, "reports")
 LOG_DIR    = os.path.join(BASE_DIR, "logs")
 UNDO_DIR   = os.path.join(BASE_DIR, "undo_logs")
-for d in (BASE_DIR, REPORT_DIR, LOG_DIR, UNDO_DIR):
-    try:
-        os.makedirs(d, exist_ok=True)
-    except Exception:
-        pass
+# 目录在首次写入时再创建（ensure_dir），导入阶段不碰磁盘，窗口更快出现
 # === MacFix end ===
 
 # 业务常量
@@ -86,6 +85,7 @@ def log_now():
 
 def write_undo_log(lines):
     try:
+        ensure_dir(UNDO_DIR)
         fn = os.path.join(UNDO_DIR, f"undo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
         with open(fn, "w", encoding="utf-8-sig") as f:
             f.writelines([x if x.endswith("\n") else x + "\n" for x in lines])
@@ -122,6 +122,8 @@ class App(tk.Tk):
         self.rule_var  = tk.StringVar(value="默认规则")
         self.sheet_var = tk.StringVar(value="数据模板.xlsx")
         self.progress  = tk.IntVar(value=0)
+        self.rate_var  = tk.StringVar(value="")
+        self.reporter  = ProgressReporter()
 
         self._build_ui()
 
@@ -157,6 +159,7 @@ class App(tk.Tk):
         row3.pack(fill="x", pady=(8,6))
         pb = ttk.Progressbar(row3, variable=self.progress, maximum=100)
         pb.pack(fill="x")
+        tk.Label(row3, textvariable=self.rate_var, bg="white", fg=COLOR_MUTED, anchor="e").pack(fill="x")
 
         # 日志
         logframe = tk.LabelFrame(main, text="运行日志", bg="white", fg=COLOR_MUTED)
@@ -178,12 +181,22 @@ class App(tk.Tk):
         if not self.dir_var.get():
             messagebox.showwarning("提示", "请选择图像根目录")
             return
+        self.progress.set(0); self.rate_var.set("")
+        self.reporter.start(0)
+        self.reporter.bind_tk(self, self._render_progress)
         threading.Thread(target=self._run, daemon=True).start()
 
+    def _render_progress(self, snap):
+        """由 ProgressReporter 在主线程定时调用（工作线程不直接改控件）。"""
+        if snap["volumes_total"]:
+            self.progress.set(int(snap["volumes_done"] * 100 / snap["volumes_total"]))
+        if snap["pages_done"]:
+            self.rate_var.set(ProgressReporter.describe(snap))
+
     # ======= 主处理逻辑（保持你们原有行为，示例化简）=======
     def _run(self):
         try:
-            self.progress.set(0)
+            self.reporter.start(2)   # 两个阶段：预检、导出
             self.logln("开始预检…")
 
             root = self.dir_var.get()
@@ -195,7 +208,7 @@ class App(tk.Tk):
             # 这里仅示例若干日志与导出
 
             self.logln("预检完成，无严重错误。")
-            self.progress.set(50)
+            self.reporter.volume_done()
 
             ensure_dir(REPORT_DIR)
             csv_path = os.path.join(REPORT_DIR, f"预检报告_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
@@ -207,11 +220,13 @@ class App(tk.Tk):
             if undo_file:
                 self.logln(f"撤销日志：{undo_file}")
 
-            self.progress.set(100)
+            self.reporter.volume_done()
             self.logln("全部完成。")
         except Exception as e:
             self.logln("发生错误：\n" + traceback.format_exc())
             messagebox.showerror("错误", str(e))
+        finally:
+            self.reporter.finish()
 
 # ----------------- 入口 -----------------
 def main():
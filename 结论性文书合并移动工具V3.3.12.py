@@ -1,23 +1,67 @@
 # -*- coding: utf-8 -*-
 # 结论性文书合并移动工具V3.3.12.py
 #
+# 任务队列：多组 Excel/根目录/输出目录/模式 持久化排队（job_queue.json），可置顶、上下移、
+#           暂停、取消，按顺序或有限并行执行；线程池、格式转换进程池、目录索引跨任务共用。
+# 格式转换：TIFF/PNG/BMP 在进程池中转成 JPG（多页 TIFF 按帧展开，保持自然页序），
+#           只转所选页，输出缓存在日志目录 norm_cache 下，源文件未更新则直接复用；
+#           启动时清理超过 NORM_CACHE_MAX_DAYS 天未用的缓存，总量超过 NORM_CACHE_MAX_MB 时从最久未用的删起
+#           （也可随时手动删除整个 norm_cache 目录，下次运行会重新转换）。
+# 进度：ProgressReporter 汇总卷/页事件，界面按固定频率合并刷新，显示 页/s、MB/s 与平滑剩余时间。
+# 预估：“预估（不执行）”按钮只解析 Excel、列目录、stat 文件大小，扣除已存在的输出，
+#       按本机历史速度（perf_stats.json，每次运行后滚动更新）估算三种模式耗时。
+# 启动加速：重模块改为首次使用时导入，窗口出现后在后台预热；bench_startup.py 守护启动耗时。
+# 并发调度：OCR / 复制改为线程池执行，ResourceGovernor 按 CPU、可用内存、复制耗时
+#           在 OCR_WORKERS / COPY_WORKERS 上下限内动态调整并发，调整记录写入日志。
+# PDF 组装：有 pikepdf 时对各页重复的字体/XObject 去重、写对象流，可选线性化；
+#           每卷日志记录组装前后体积与写入耗时。无 pikepdf 时回退 PyPDF2。
+#
 # 在 V3.3.11 基础上新增：
 # - 运行结束弹窗后，自动生成并打开 “核查清单.xlsx”（Excel 2007 兼容 .xlsx）
 # - 清单包含列：类别(JPG/PDF)｜档号｜原因｜详情/路径
 # - 所有“跳过/失败”的场景均会记录一条，便于后续核对
 
-import os, re, sys, tempfile, shutil, threading, time, subprocess
+import os, re, sys, json, platform, tempfile, shutil, threading, time, subprocess, hashlib, functools, queue
 from pathlib import Path
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import Counter
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
 
-import pandas as pd
-from PIL import Image, ImageTk
-import pytesseract
-from PyPDF2 import PdfMerger
+from progress_report import ProgressReporter
+
+# pandas / PIL / pytesseract / PyPDF2 / pikepdf / psutil 均在首次使用处导入，
+# 窗口先出现，重模块在后台预热（见 _warm_imports）。
+
+@functools.lru_cache(maxsize=None)
+def _pikepdf():
+    """可选：资源去重 / 对象流压缩 / 线性化；未安装返回 None。"""
+    try:
+        import pikepdf
+        return pikepdf
+    except Exception:
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _psutil():
+    """可选：CPU / 内存采样（缺失时走系统接口兜底）；未安装返回 None。"""
+    try:
+        import psutil
+        return psutil
+    except Exception:
+        return None
+
+def _warm_imports():
+    """后台线程预先导入运行时才用到的重模块，缩短首次点击“开始”的等待。"""
+    try:
+        import pandas, PIL.Image, pytesseract, PyPDF2  # noqa: F401
+        _pikepdf(); _psutil()
+    except Exception:
+        pass
 
 # ================== 主题 / 常量 ==================
 THEME_PRIMARY   = "#14b8a6"
@@ -32,9 +76,43 @@ BORDER          = "#e5e7eb"
 DEFAULT_LANG    = "chi_sim"   # 固定中文
 PSM_FIXED       = 6           # 固定 PSM=6
 ALLOWED_EXTS    = (".jpg", ".jpeg")
+NORMALIZE_EXTS  = (".tif", ".tiff", ".png", ".bmp")   # 先转成 JPG 再进入流程
 LOGO_MAX_PX     = 160
 
 SYS_TESS_EXE    = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+RANGE_COLS      = ("结论文书的页码范围", "法律结论文书的页码范围")   # 新名优先，兼容旧名
+
+# 预估用的默认速度（本机尚无历史记录时使用），运行后以实测值滚动更新
+PERF_STATS_NAME = "perf_stats.json"
+PERF_DEFAULTS   = {"ocr_sec_per_page": 3.0, "copy_bytes_per_sec": 20 * 2**20, "asm_sec_per_page": 0.05,
+                   "norm_sec_per_page": 0.5}
+PERF_EMA_ALPHA  = 0.3
+
+# 任务队列（日志目录下持久化；列表顺序即优先级）
+JOB_QUEUE_NAME  = "job_queue.json"
+JOB_PARALLEL    = (1, 4)          # 同时运行的任务数：(默认, 上限)
+JOB_MODES       = {"复制 + 生成PDF": (True, True), "只复制图片": (True, False), "只生成PDF": (False, True)}
+
+# 并发上下限 (最小, 最大)；上下限相同即为固定并发，便于与自适应对比
+CPU_COUNT       = os.cpu_count() or 2
+OCR_WORKERS     = (1, CPU_COUNT)
+COPY_WORKERS    = (1, 8)
+GOV_INTERVAL    = 2.0             # 采样间隔（秒）
+GOV_CPU_HIGH    = 90              # CPU% 高于此值 → 降 OCR 并发
+GOV_CPU_LOW     = 65              # CPU% 低于此值 → 升 OCR 并发
+GOV_MEM_LOW     = 1.5 * 2**30     # 可用内存低于此值 → 降 OCR 并发（大幅彩色 TIFF 解码吃内存）
+GOV_MEM_OK      = 3.0 * 2**30     # 可用内存高于此值才允许升 OCR 并发
+GOV_IO_SLOW_MS  = 800             # 单文件复制平均耗时高于此值 → 降复制并发
+
+# 图像规范化（TIFF / PNG / BMP → JPG，多页 TIFF 按帧展开）
+NORM_JPEG_QUALITY = 90
+NORM_DPI          = 300                     # 源图 DPI 更高时按比例缩小到此值；None 表示保持原分辨率
+NORM_WORKERS      = max(1, CPU_COUNT // 2)  # 进程池大小；大幅彩色 TIFF 解码占内存，保守取半
+NORM_CACHE_NAME   = "norm_cache"            # 位于日志目录下，按源目录分子目录
+NORM_CACHE_MAX_DAYS = 30                    # 超过此天数未使用的源目录缓存在启动时删除
+NORM_CACHE_MAX_MB   = 4096                  # 缓存总量上限，超出时从最久未用的源目录删起
+
+LOG_UI_MS           = 100         # 日志窗口刷新间隔（毫秒）
 
 # 运行时全局
 CUR_TESS_EXE   = None
@@ -58,11 +136,12 @@ def natural_keys(text):
 
 def list_images_sorted(folder: str):
     p = Path(folder)
-    files = [x for x in p.iterdir() if x.suffix.lower() in ALLOWED_EXTS]
+    files = [x for x in p.iterdir() if x.suffix.lower() in ALLOWED_EXTS + NORMALIZE_EXTS]
     files.sort(key=lambda x: natural_keys(x.name))
     return [str(x) for x in files]
 
 def parse_ranges(rng_str):
+    import pandas as pd
     if pd.isna(rng_str):
         return []
     s = str(rng_str).strip()
@@ -90,8 +169,7 @@ def parse_ranges(rng_str):
             seen.add(x); uniq.append(x)
     return uniq
 
-def prepare_log_file():
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+def _log_dir() -> Path:
     target_dir = Path("D:/") if Path("D:/").exists() else (Path.home() / "Documents")
     target_dir = target_dir / "OCR_Logs"
     try:
@@ -99,7 +177,283 @@ def prepare_log_file():
     except Exception:
         target_dir = _base_dir() / "OCR_Logs"
         target_dir.mkdir(parents=True, exist_ok=True)
-    return _norm(target_dir / f"log_{ts}.txt")
+    return target_dir
+
+def prepare_log_file():
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return _norm(_log_dir() / f"log_{ts}.txt")
+
+def _fmt_duration(sec: float) -> str:
+    sec = int(round(sec))
+    if sec >= 3600: return f"{sec // 3600}小时{sec % 3600 // 60:02d}分"
+    if sec >= 60:   return f"{sec // 60}分{sec % 60:02d}秒"
+    return f"{sec}秒"
+
+def read_task_table(excel_path: str):
+    """读取 Excel，返回 (按档号自然排序的 df, 页码范围列名)；缺列时抛 ValueError。"""
+    import pandas as pd
+    df = pd.read_excel(excel_path, engine="openpyxl", dtype=str)
+    rng_col = next((c for c in RANGE_COLS if c in df.columns), None)
+    if ("档号" not in df.columns) or (rng_col is None):
+        raise ValueError("Excel需包含列：‘档号’ 与 ‘结论文书的页码范围’（或旧名‘法律结论文书的页码范围’）")
+    df = df[["档号", rng_col]].dropna(subset=["档号"]).copy()
+    df = df.sort_values(by="档号", key=lambda s: s.map(natural_keys)).reset_index(drop=True)
+    return df, rng_col
+
+# ================== 图像规范化 ==================
+def _norm_cache_dir(folder: str) -> Path:
+    key = hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()[:16]
+    return _log_dir() / NORM_CACHE_NAME / key
+
+def prune_norm_cache(max_days=NORM_CACHE_MAX_DAYS, max_mb=NORM_CACHE_MAX_MB):
+    """
+    按源目录清理 norm_cache：子目录 mtime 即最近使用时间（normalize_pages 每次使用时刷新），
+    先删超过 max_days 天未用的，总量仍超过 max_mb 时从最久未用的删起。返回 (删除目录数, 释放字节)。
+    """
+    root = _log_dir() / NORM_CACHE_NAME
+    if not root.is_dir():
+        return 0, 0
+    entries = []
+    for d in os.scandir(root):
+        if not d.is_dir(follow_symlinks=False): continue
+        size = sum(f.stat().st_size for f in os.scandir(d.path) if f.is_file())
+        entries.append((d.stat().st_mtime, size, d.path))
+    entries.sort()                                      # 最久未用的在前
+    cutoff = time.time() - max_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = freed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_mb * 2**20:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size; removed += 1; freed += size
+    return removed, freed
+
+def _image_frames(path: str) -> int:
+    """帧数：只有 TIFF 需要打开（读文件头/IFD 链，不解码像素）。"""
+    if not path.lower().endswith((".tif", ".tiff")):
+        return 1
+    from PIL import Image
+    with Image.open(path) as im:
+        return getattr(im, "n_frames", 1)
+
+def scan_folder_pages(folder: str):
+    """
+    按自然顺序列出卷内各页，返回 [(源文件, 帧号, 转换后文件名)]。
+    JPG 原样使用（帧号/文件名为 None）；TIFF/PNG/BMP 按帧展开，转换后为
+    “名称.jpg”（多页为“名称_p0001.jpg”…），与其他文件同名时保留原扩展名避免冲突。
+    """
+    files = list_images_sorted(folder)
+    stems = Counter(Path(f).stem.lower() for f in files)
+    pages = []
+    for f in files:
+        if f.lower().endswith(ALLOWED_EXTS):
+            pages.append((f, None, None)); continue
+        stem = Path(f).stem if stems[Path(f).stem.lower()] == 1 else Path(f).name
+        n = _image_frames(f)
+        for i in range(n):
+            pages.append((f, i, f"{stem}.jpg" if n == 1 else f"{stem}_p{i + 1:04d}.jpg"))
+    return pages
+
+def _norm_up_to_date(src: str, out: Path) -> bool:
+    try:
+        return out.stat().st_mtime >= os.stat(src).st_mtime
+    except OSError:
+        return False
+
+def _transcode_frames(src: str, jobs, quality: int, dpi):
+    """（进程池内执行）把 src 的若干帧转成 JPG。jobs: [(帧号, 输出路径)]。"""
+    from PIL import Image
+    with Image.open(src) as im:
+        src_dpi = im.info.get("dpi", (0, 0))[0] or None
+        for frame, out in jobs:
+            im.seek(frame)
+            fr = im
+            if fr.mode == "P":
+                fr = fr.convert("RGBA")
+            if fr.mode in ("RGBA", "LA"):
+                bg = Image.new("RGB", fr.size, "white")
+                bg.paste(fr.convert("RGBA"), mask=fr.getchannel("A"))
+                fr = bg
+            elif fr.mode.startswith("I"):
+                # 16/32 位灰度直接 convert("L") 会截断到 255 而整页发白，先按位深缩放到 8 位
+                hi = 65535 if fr.mode.startswith("I;16") else (fr.getextrema()[1] or 0)
+                fr = fr.convert("I")
+                if hi > 255:
+                    fr = fr.point(lambda v: v * (255 / hi))
+                fr = fr.convert("L")
+            elif fr.mode in ("1", "F"):
+                fr = fr.convert("L")
+            elif fr.mode not in ("RGB", "L"):
+                fr = fr.convert("RGB")
+            out_dpi = dpi or src_dpi
+            if dpi and src_dpi and src_dpi > dpi:
+                w, h = fr.size
+                fr = fr.resize((max(1, round(w * dpi / src_dpi)), max(1, round(h * dpi / src_dpi))), Image.LANCZOS)
+            elif src_dpi and dpi:
+                out_dpi = src_dpi
+            extra = {"dpi": (round(out_dpi), round(out_dpi))} if out_dpi else {}
+            tmp = f"{out}.{os.getpid()}_{threading.get_ident()}.part"   # 并行任务可能同时转换同一目录
+            fr.save(tmp, format="JPEG", quality=quality, **extra)
+            os.replace(tmp, out)
+    return len(jobs)
+
+def pending_normalization(folder: str, refs) -> int:
+    """所选页中缓存缺失或过期、需要转换的页数（只 stat，不读像素）。"""
+    cache = _norm_cache_dir(folder)
+    return sum(1 for src, _, name in refs if name and not _norm_up_to_date(src, cache / name))
+
+def normalize_pages(folder: str, refs, pool=None):
+    """
+    把所选页中非 JPG 的帧转换到缓存目录（已是最新的跳过），按原顺序返回 JPG 路径。
+    pool 为 ProcessPoolExecutor 时按源文件并行；返回 (路径列表, 转换页数, {源文件: 错误})。
+    """
+    cache = _norm_cache_dir(folder)
+    todo = {}
+    for src, frame, name in refs:
+        if name and not _norm_up_to_date(src, cache / name):
+            todo.setdefault(src, []).append((frame, str(cache / name)))
+    errors = {}
+    if cache.is_dir():
+        os.utime(cache)                                 # 记录最近使用时间，供 prune_norm_cache 判断
+    if todo:
+        cache.mkdir(parents=True, exist_ok=True)
+        if pool is None:
+            for src, jobs in todo.items():
+                try: _transcode_frames(src, jobs, NORM_JPEG_QUALITY, NORM_DPI)
+                except Exception as e: errors[src] = e
+        else:
+            futs = {src: pool.submit(_transcode_frames, src, jobs, NORM_JPEG_QUALITY, NORM_DPI)
+                    for src, jobs in todo.items()}
+            for src, fut in futs.items():
+                try: fut.result()
+                except Exception as e: errors[src] = e
+    paths = [src if name is None else str(cache / name) for src, _, name in refs]
+    converted = sum(len(jobs) for src, jobs in todo.items() if src not in errors)
+    return paths, converted, errors
+
+class FolderIndex:
+    """
+    scan_folder_pages 的结果缓存，队列中的任务共用一份。目录 mtime 或任一 TIFF/PNG/BMP
+    的 mtime/大小变化即失效（原地覆盖多页 TIFF 不改目录 mtime，但帧数可能变了）。
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    @staticmethod
+    def _key(folder: str):
+        frames = []
+        for e in os.scandir(folder):
+            if e.is_file() and e.name.lower().endswith(NORMALIZE_EXTS):
+                st = e.stat(); frames.append((e.name, st.st_mtime_ns, st.st_size))
+        return os.stat(folder).st_mtime_ns, tuple(sorted(frames))
+
+    def pages(self, folder: str):
+        try:
+            key = self._key(folder)
+        except OSError:
+            return []
+        with self._lock:
+            hit = self._cache.get(folder)
+        if hit and hit[0] == key:
+            return hit[1]
+        refs = scan_folder_pages(folder)
+        with self._lock:
+            self._cache[folder] = (key, refs)
+        return refs
+
+# ================== 历史耗时 / 预估 ==================
+def load_perf_stats() -> dict:
+    """本机历史速度（按主机名区分），缺项用 PERF_DEFAULTS 补齐并标记 runs=0。"""
+    stats = dict(PERF_DEFAULTS, runs=0)
+    try:
+        with open(_log_dir() / PERF_STATS_NAME, encoding="utf-8") as f:
+            stats.update(json.load(f).get(platform.node(), {}))
+    except Exception:
+        pass
+    return stats
+
+_perf_lock = threading.Lock()      # perf_stats.json 读-改-写
+
+def record_perf_stats(perf: dict):
+    """
+    用本次运行的实测值（墙钟时间，已含并发效果）滚动更新本机历史速度。
+    perf: norm_secs/norm_pages、copy_secs/copy_bytes、ocr_secs/ocr_pages、asm_secs/asm_pages。
+    与其他任务重叠运行时各阶段墙钟互相交叠，调用方应跳过记录。
+    """
+    with _perf_lock:
+        _record_perf_stats_locked(perf)
+
+def _record_perf_stats_locked(perf: dict):
+    path = _log_dir() / PERF_STATS_NAME
+    try:
+        with open(path, encoding="utf-8") as f: allstats = json.load(f)
+    except Exception:
+        allstats = {}
+    mine = allstats.get(platform.node(), {})
+    samples = {
+        "norm_sec_per_page":  (perf["norm_secs"] / perf["norm_pages"])  if perf["norm_pages"] else None,
+        "copy_bytes_per_sec": (perf["copy_bytes"] / perf["copy_secs"]) if perf["copy_bytes"] and perf["copy_secs"] > 0 else None,
+        "ocr_sec_per_page":   (perf["ocr_secs"] / perf["ocr_pages"])    if perf["ocr_pages"] else None,
+        "asm_sec_per_page":   (perf["asm_secs"] / perf["asm_pages"])    if perf["asm_pages"] else None,
+    }
+    for k, v in samples.items():
+        if v is None: continue
+        mine[k] = v if k not in mine else (1 - PERF_EMA_ALPHA) * mine[k] + PERF_EMA_ALPHA * v
+    mine["runs"] = mine.get("runs", 0) + 1
+    mine["updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    allstats[platform.node()] = mine
+    tmp = path.with_suffix(".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(allstats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+def plan_workload(excel_path, img_root, pdf_out="", copy_out="", index: FolderIndex | None = None) -> dict:
+    """
+    预估工作量：逐行解析档号与页码、列目录、stat 文件大小，不读取像素
+    （多页 TIFF 每个文件只读一次文件头数帧数）。已存在的 JPG / PDF 输出与已转换的缓存
+    视为已完成，从待处理量中扣除。
+    """
+    df, rng_col = read_task_table(excel_path)
+    plan = {"volumes": len(df), "problems": 0, "pages": 0, "norm_pages": 0,
+            "copy_files": 0, "copy_bytes": 0, "copy_done": 0,
+            "ocr_volumes": 0, "ocr_pages": 0, "pdf_done": 0}
+    for _, row in df.iterrows():
+        danghao = str(row["档号"]).strip()
+        folder  = _norm(Path(img_root) / danghao)
+        all_refs = (index.pages(folder) if index else scan_folder_pages(folder)) if os.path.isdir(folder) else []
+        valid_pages = [p for p in parse_ranges(row[rng_col]) if 1 <= p <= len(all_refs)]
+        if not valid_pages:
+            plan["problems"] += 1; continue
+        refs = [all_refs[p-1] for p in valid_pages]
+        frames = Counter(src for src, _, _ in all_refs)     # 每个源文件的帧数，按帧均摊文件大小
+        plan["pages"] += len(refs)
+        plan["norm_pages"] += pending_normalization(folder, refs)
+
+        for src, _, name in refs:
+            if copy_out and (Path(copy_out) / danghao / (name or os.path.basename(src))).exists():
+                plan["copy_done"] += 1
+            else:
+                plan["copy_files"] += 1
+                try: plan["copy_bytes"] += os.path.getsize(src) // frames[src]
+                except OSError: pass
+
+        if pdf_out and (Path(pdf_out) / danghao / f"{danghao}.pdf").exists():
+            plan["pdf_done"] += 1
+        else:
+            plan["ocr_volumes"] += 1
+            plan["ocr_pages"] += len(refs)
+    return plan
+
+def estimate_seconds(plan: dict, stats: dict) -> dict:
+    """按本机历史速度估算三种模式的墙钟耗时（秒）。"""
+    norm = plan["norm_pages"] * stats["norm_sec_per_page"]
+    copy = plan["copy_bytes"] / max(stats["copy_bytes_per_sec"], 1.0)
+    pdf  = plan["ocr_pages"] * (stats["ocr_sec_per_page"] + stats["asm_sec_per_page"])
+    return {"copy": norm + copy, "pdf": norm + pdf, "both": norm + copy + pdf}
 
 # ================== Tesseract ==================
 def _apply_tesseract(exe_path: str | Path) -> bool:
@@ -112,6 +466,7 @@ def _apply_tesseract(exe_path: str | Path) -> bool:
         return False
     CUR_TESS_EXE  = _norm(exe)
     CUR_TESSDATA  = _norm(tdata)
+    import pytesseract
     pytesseract.pytesseract.tesseract_cmd = CUR_TESS_EXE
     os.environ["TESSDATA_PREFIX"] = CUR_TESSDATA
     return True
@@ -128,6 +483,368 @@ def _tess_ready() -> bool:
     except Exception:
         return False
 
+# ================== 并发调度 ==================
+def _sample_memory_available():
+    """可用物理内存（字节），取不到返回 None。"""
+    psutil = _psutil()
+    if psutil is not None:
+        try: return psutil.virtual_memory().available
+        except Exception: pass
+    if sys.platform.startswith("win"):
+        try:
+            import ctypes
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+            st = MEMORYSTATUSEX(); st.dwLength = ctypes.sizeof(st)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(st)):
+                return st.ullAvailPhys
+        except Exception:
+            pass
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    return None
+
+_cpu_times_prev = {}    # GetSystemTimes 上次读数：(空闲, 内核+用户)
+
+def _sample_cpu_percent():
+    """整机 CPU 占用百分比（自上次调用以来），取不到返回 None（首次调用只建立基线）。"""
+    psutil = _psutil()
+    if psutil is not None:
+        try: return psutil.cpu_percent(interval=None)
+        except Exception: pass
+    if sys.platform.startswith("win"):
+        try:
+            import ctypes
+            idle, kernel, user = ctypes.c_ulonglong(), ctypes.c_ulonglong(), ctypes.c_ulonglong()
+            if ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+                cur = (idle.value, kernel.value + user.value)      # 内核时间已含空闲时间
+                prev = _cpu_times_prev.get("win"); _cpu_times_prev["win"] = cur
+                if prev and cur[1] > prev[1]:
+                    return max(0.0, min(100.0, 100.0 * (1 - (cur[0] - prev[0]) / (cur[1] - prev[1]))))
+                return None
+        except Exception:
+            pass
+    try:
+        return min(100.0, os.getloadavg()[0] / CPU_COUNT * 100)
+    except Exception:
+        return None
+
+class ResourceGovernor:
+    """
+    运行时并发调度：每隔 GOV_INTERVAL 秒采样 CPU、可用内存与复制耗时，
+    在配置上下限内调整 OCR / 复制的并发名额；每次调整都写日志。
+    用法：with gov.slot("ocr"): ...
+    """
+    def __init__(self, log=None, limits=None):
+        self.limits = dict(limits or {"ocr": OCR_WORKERS, "copy": COPY_WORKERS})
+        self.cur = {
+            "ocr":  max(self.limits["ocr"][0],  min(self.limits["ocr"][1],  CPU_COUNT // 2 or 1)),
+            "copy": max(self.limits["copy"][0], min(self.limits["copy"][1], 4)),
+        }
+        self.active = {k: 0 for k in self.cur}
+        self._log = log
+        self._cond = threading.Condition()
+        self._next_tick = time.monotonic() + GOV_INTERVAL
+        self._io_secs = self._io_bytes = 0.0
+        self._io_files = 0
+        self._copy_rate_prev = None
+        self._copy_dir = 1
+        _sample_cpu_percent()   # psutil 首次调用只建立基线
+
+    def max_workers(self, kind) -> int:
+        return self.limits[kind][1]
+
+    def describe(self) -> str:
+        return (f"OCR {self.cur['ocr']}（{self.limits['ocr'][0]}–{self.limits['ocr'][1]}），"
+                f"复制 {self.cur['copy']}（{self.limits['copy'][0]}–{self.limits['copy'][1]}）")
+
+    @contextmanager
+    def slot(self, kind):
+        msgs = []
+        with self._cond:
+            msgs += self._tick_locked()
+            while self.active[kind] >= self.cur[kind]:
+                self._cond.wait(GOV_INTERVAL)
+                msgs += self._tick_locked()
+            self.active[kind] += 1
+        self._emit(msgs)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.active[kind] -= 1
+                self._cond.notify_all()
+
+    def observe_io(self, seconds: float, nbytes: int):
+        with self._cond:
+            self._io_secs += seconds; self._io_bytes += nbytes; self._io_files += 1
+
+    def _emit(self, msgs):
+        if self._log:
+            for m in msgs: self._log(m)
+
+    def _set(self, kind, new, why):
+        lo, hi = self.limits[kind]
+        new = max(lo, min(hi, new))
+        if new == self.cur[kind]:
+            return None
+        old, self.cur[kind] = self.cur[kind], new
+        self._cond.notify_all()
+        return f"⚙ 并发调整：{'OCR' if kind == 'ocr' else '复制'} {old}→{new}（{why}）"
+
+    def _tick_locked(self):
+        now = time.monotonic()
+        if now < self._next_tick:
+            return []
+        elapsed = now - self._next_tick + GOV_INTERVAL
+        self._next_tick = now + GOV_INTERVAL
+        msgs = []
+
+        cpu, mem = _sample_cpu_percent(), _sample_memory_available()
+        state = (f"CPU {cpu:.0f}%" if cpu is not None else "CPU ?") + "，" + \
+                (f"可用内存 {mem / 2**30:.1f}GB" if mem is not None else "可用内存 ?")
+        if (mem is not None and mem < GOV_MEM_LOW) or (cpu is not None and cpu > GOV_CPU_HIGH):
+            msgs.append(self._set("ocr", self.cur["ocr"] - 1, state))
+        elif (cpu is None or cpu < GOV_CPU_LOW) and (mem is None or mem > GOV_MEM_OK) \
+                and self.active["ocr"] >= self.cur["ocr"]:
+            msgs.append(self._set("ocr", self.cur["ocr"] + 1, state))
+
+        # 复制：平均单文件耗时过高先降；否则按吞吐量爬山（变好继续同向，变差反向）
+        if self._io_files:
+            lat_ms = self._io_secs / self._io_files * 1000
+            rate = self._io_bytes / max(elapsed, 1e-6)
+            io_state = f"I/O {lat_ms:.0f}ms/文件，{rate / 2**20:.1f}MB/s"
+            if lat_ms > GOV_IO_SLOW_MS:
+                self._copy_dir = -1
+            elif self._copy_rate_prev is not None and rate < self._copy_rate_prev * 0.95:
+                self._copy_dir = -self._copy_dir
+            if self.active["copy"] >= self.cur["copy"] or self._copy_dir < 0:
+                msgs.append(self._set("copy", self.cur["copy"] + self._copy_dir, io_state))
+            self._copy_rate_prev = rate
+            self._io_secs = self._io_bytes = 0.0
+            self._io_files = 0
+        return [m for m in msgs if m]
+
+# ================== PDF 组装 ==================
+# 每页 PDF 由 image_to_pdf_or_hocr 单独生成，各自内嵌一份 GlyphLessFont。
+# 组装时按内容摘要合并相同的字体/XObject，再以对象流压缩写出。
+DEDUP_RES_KINDS = ("/Font", "/XObject")
+
+def _fmt_size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+
+def _pdf_obj_digest(obj, h, stack):
+    """递归计算 pikepdf 对象的内容摘要（忽略对象编号与 /Length）。"""
+    pikepdf = _pikepdf()
+    if isinstance(obj, pikepdf.Object) and obj.is_indirect:
+        og = obj.objgen
+        if og in stack:
+            h.update(b"<cycle>"); return
+        stack = stack | {og}
+    if isinstance(obj, pikepdf.Stream):
+        h.update(b"S")
+        _pdf_obj_digest(obj.stream_dict, h, stack)
+        h.update(obj.read_raw_bytes())
+    elif isinstance(obj, pikepdf.Dictionary):
+        h.update(b"D")
+        for k in sorted(obj.keys()):
+            if k == "/Length": continue
+            h.update(k.encode("latin-1"))
+            _pdf_obj_digest(obj[k], h, stack)
+    elif isinstance(obj, pikepdf.Array):
+        h.update(b"A")
+        for x in obj:
+            _pdf_obj_digest(x, h, stack)
+    elif isinstance(obj, pikepdf.Object):
+        h.update(obj.unparse())
+    else:
+        h.update(repr(obj).encode("utf-8"))
+
+def _dedup_page_resources(pdf) -> int:
+    """把各页内容相同的资源指向同一个间接对象，返回被合并的资源数。"""
+    first_seen, merged = {}, 0
+    for page in pdf.pages:
+        res = page.obj.get("/Resources")
+        if res is None: continue
+        for kind in DEDUP_RES_KINDS:
+            group = res.get(kind)
+            if group is None: continue
+            for name in list(group.keys()):
+                obj = group[name]
+                if not obj.is_indirect: continue
+                h = hashlib.sha1()
+                _pdf_obj_digest(obj, h, frozenset())
+                key = (kind, h.digest())
+                keep = first_seen.setdefault(key, obj)
+                if keep.objgen != obj.objgen:
+                    group[name] = keep
+                    merged += 1
+    return merged
+
+def assemble_pdf(part_pdfs, out_path, linearize: bool = False) -> dict:
+    """
+    合并单页 PDF 为整卷 PDF。
+    有 pikepdf：去重共享资源 + 对象流 + 可选线性化；否则回退 PyPDF2 原样拼接。
+    返回 {"pages", "merged", "before", "after", "seconds", "engine"}。
+    """
+    t0 = time.perf_counter()
+    before = sum(os.path.getsize(p) for p in part_pdfs)
+    merged = 0
+    pikepdf = _pikepdf()
+    if pikepdf is not None:
+        sources = []
+        try:
+            with pikepdf.new() as pdf:
+                for pth in part_pdfs:
+                    src = pikepdf.open(pth); sources.append(src)
+                    pdf.pages.extend(src.pages)
+                merged = _dedup_page_resources(pdf)
+                pdf.save(
+                    str(out_path),
+                    compress_streams=True,
+                    object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                    linearize=linearize,
+                )
+        finally:
+            for src in sources: src.close()
+        engine = "pikepdf"
+    else:
+        from PyPDF2 import PdfMerger
+        merger = PdfMerger()
+        try:
+            for pth in part_pdfs: merger.append(pth)
+            with open(out_path, "wb") as f: merger.write(f)
+        finally:
+            merger.close()
+        engine = "PyPDF2"
+    return {
+        "pages": len(part_pdfs), "merged": merged, "engine": engine,
+        "before": before, "after": os.path.getsize(out_path),
+        "seconds": time.perf_counter() - t0,
+    }
+
+# ================== 单页处理 ==================
+def copy_image(src: str, dst: Path, gov: ResourceGovernor) -> bool:
+    """复制单张图片；目标已存在返回 False（跳过）。"""
+    if dst.exists():
+        return False
+    with gov.slot("copy"):
+        t0 = time.perf_counter()
+        shutil.copy2(src, dst)
+        gov.observe_io(time.perf_counter() - t0, os.path.getsize(dst))
+    return True
+
+def ocr_page_to_pdf(img_path: str, out_page: Path, gov: ResourceGovernor) -> str:
+    """对单张图片 OCR 并写出单页可检索 PDF，返回其路径。"""
+    from PIL import Image
+    import pytesseract
+    with gov.slot("ocr"):
+        with Image.open(img_path) as im:
+            if im.mode not in ("RGB", "L"):
+                im = im.convert("RGB")
+            pdf_bytes = pytesseract.image_to_pdf_or_hocr(
+                im, extension="pdf", lang=DEFAULT_LANG, config=CUR_TESSCFG
+            )
+    with open(out_page, "wb") as f:
+        f.write(pdf_bytes)
+    return str(out_page)
+
+# ================== 任务队列 ==================
+class JobQueue:
+    """
+    持久化任务队列：每个任务 = Excel + 原图像根目录 + 输出目录 + 模式。
+    列表顺序即优先级；线程安全，每次修改立即写回 job_queue.json。
+    状态：等待 / 运行中 / 暂停 / 完成 / 失败 / 已取消。
+    程序重启时，上次中断的“运行中”任务恢复为“等待”（已存在的输出会被跳过）。
+    """
+    FINISHED = ("完成", "失败", "已取消")
+
+    def __init__(self, path=None):
+        self.path = Path(path or (_log_dir() / JOB_QUEUE_NAME))
+        self._lock = threading.RLock()
+        self.jobs = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.jobs = json.load(f)
+        except Exception:
+            self.jobs = []
+        for job in self.jobs:
+            if job.get("status") == "运行中":
+                job["status"] = "等待"
+
+    def _save(self):
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.jobs, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def _index(self, job_id):
+        """任务下标；任务已被删除时返回 None。"""
+        return next((i for i, j in enumerate(self.jobs) if j["id"] == job_id), None)
+
+    def snapshot(self):
+        with self._lock:
+            return [dict(j) for j in self.jobs]
+
+    def get(self, job_id):
+        with self._lock:
+            i = self._index(job_id)
+            return None if i is None else dict(self.jobs[i])
+
+    def add(self, **fields) -> dict:
+        with self._lock:
+            n = max((int(j["id"][1:]) for j in self.jobs), default=0) + 1
+            job = dict(fields, id=f"J{n:03d}", status="等待", summary="",
+                       added=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            self.jobs.append(job); self._save()
+            return dict(job)
+
+    def move(self, job_id, delta: int):
+        """delta<0 上移，>0 下移；传入很大的负数即置顶。"""
+        with self._lock:
+            i = self._index(job_id)
+            if i is None: return
+            k = max(0, min(len(self.jobs) - 1, i + delta))
+            self.jobs.insert(k, self.jobs.pop(i)); self._save()
+
+    def remove(self, job_id):
+        with self._lock:
+            i = self._index(job_id)
+            if i is not None and self.jobs[i]["status"] != "运行中":
+                self.jobs.pop(i); self._save()
+
+    def set_status(self, job_id, status, **extra):
+        with self._lock:
+            i = self._index(job_id)
+            if i is not None:
+                self.jobs[i].update(extra, status=status); self._save()
+
+    def take_next(self):
+        """取队首第一个“等待”的任务并标记为运行中；没有则返回 None。"""
+        with self._lock:
+            for job in self.jobs:
+                if job["status"] == "等待":
+                    job["status"] = "运行中"
+                    job["started"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    self._save()
+                    return dict(job)
+            return None
+
 # ================== 应用 ==================
 class App:
     def __init__(self, root: tk.Tk):
@@ -137,6 +854,23 @@ class App:
         root.configure(bg=THEME_BG)
         self._apply_theme()
 
+        self._log_lock = threading.Lock()   # 只保护日志文件追加，不包住 Tk 调用
+        self._log_q = queue.Queue()         # 任意线程写入日志行 / 界面回调，主线程 _drain_log 取出执行
+        self._tls = threading.local()       # 当前任务的核查清单 / 日志标签 / 日志文件（按线程区分）
+
+        # 所有任务共用的资源（首次使用时创建，见 _shared）
+        self._res = None
+        self._res_lock = threading.Lock()
+
+        # 任务队列
+        self.queue = JobQueue()
+        self._queue_cond = threading.Condition()
+        self._queue_thread = None
+        self._running = {}                  # 任务id -> (控制事件, ProgressReporter)
+        self._active_runs = []              # 正在执行的 _worker 各自的 {"overlap": bool}（受 _res_lock 保护）
+        self._parallel = JOB_PARALLEL[0]
+        self._queue_win = None
+
         # 记录核查项（跳过/失败）
         self.check_items = []   # 每一项：{"类别": "JPG/PDF", "档号": str, "原因": str, "详情/路径": str}
 
@@ -172,6 +906,7 @@ class App:
         self.output_pdf_dir  = tk.StringVar()
         self.copy_target_dir = tk.StringVar()
         self.tesseract_path  = tk.StringVar(value=SYS_TESS_EXE if os.path.exists(SYS_TESS_EXE) else "")
+        self.pdf_linearize   = tk.BooleanVar(value=False)
 
         # 表单
         form = tk.Frame(root, bg=THEME_BG, highlightbackground=BORDER, highlightthickness=1, bd=0)
@@ -199,9 +934,13 @@ class App:
         ttk.Button(form, text="浏览", command=self.choose_tesseract)\
             .grid(row=4, column=2, padx=10, pady=ROW_PADY, sticky="w")
 
+        tk.Checkbutton(form, text="PDF 线性化（快速网页查看，需 pikepdf）", variable=self.pdf_linearize,
+                       bg=THEME_BG, fg=THEME_FG, activebackground=THEME_BG, anchor="w")\
+            .grid(row=5, column=1, padx=6, pady=(0, ROW_PADY), sticky="w")
+
         # 操作按钮
         bar = tk.Frame(root, bg=THEME_BG); bar.pack(fill="x", padx=12, pady=(6, 8))
-        for col, w in enumerate((2,1,1,1,1)): bar.grid_columnconfigure(col, weight=w)
+        for col, w in enumerate((2,1,1,1,1,1,1)): bar.grid_columnconfigure(col, weight=w)
         self.btn_both = ttk.Button(bar, text="复制 + 生成PDF",
                                    command=lambda: self.run(do_copy=True, do_pdf=True),
                                    style="Primary.TButton")
@@ -216,6 +955,10 @@ class App:
             .grid(row=0, column=3, padx=6, sticky="we")
         ttk.Button(bar, text="打开复制目录", command=lambda: self.open_dir(self.copy_target_dir.get()))\
             .grid(row=0, column=4, padx=6, sticky="we")
+        self.btn_plan = ttk.Button(bar, text="预估（不执行）", command=self.plan)
+        self.btn_plan.grid(row=0, column=5, padx=6, sticky="we")
+        ttk.Button(bar, text="任务队列", command=self.open_queue)\
+            .grid(row=0, column=6, padx=6, sticky="we")
 
         # 进度
         prog = tk.Frame(root, bg=THEME_BG); prog.pack(fill="x", padx=12, pady=(4,2))
@@ -236,6 +979,11 @@ class App:
         tk.Label(prog2, textvariable=self.pb_item_val, width=10, anchor="w",
                  bg=THEME_BG, fg=THEME_MUTED).pack(side="left")
 
+        self.rate_var = tk.StringVar(value="")
+        tk.Label(root, textvariable=self.rate_var, anchor="e", bg=THEME_BG, fg=THEME_MUTED)\
+            .pack(fill="x", padx=(12, 110), pady=(0, 4))
+        self._shown_progress = None         # 进度条当前显示哪个任务
+
         # 日志
         log_frame = tk.Frame(root, bg=THEME_BG)
         log_frame.pack(fill="both", expand=True, padx=12, pady=(0, 6))
@@ -249,10 +997,21 @@ class App:
         ttk.Button(path_bar, text="打开日志", command=self.open_log_file).pack(side="left")
         self.log = ScrolledText(log_frame, height=14, bg=TEXT_BG, fg=THEME_FG, insertbackground=THEME_FG)
         self.log.pack(fill="both", expand=True)
+        self.root.after(LOG_UI_MS, self._drain_log)
 
         # 启动提示
         self._log("准备就绪：依次选择 Excel、原图像根目录、PDF 输出目录、图片复制目录…")
         self._log(f"日志已启动，自动保存到：{self.log_path}")
+        self.root.after(300, lambda: threading.Thread(target=_warm_imports, daemon=True).start())
+        self.root.after(1000, lambda: threading.Thread(target=self._prune_cache, daemon=True).start())
+
+    def _prune_cache(self):
+        try:
+            removed, freed = prune_norm_cache()
+            if removed:
+                self._log(f"已清理格式转换缓存：{removed} 个目录，释放 {_fmt_size(freed)}")
+        except Exception as e:
+            self._log(f"清理格式转换缓存失败：{e}")
 
     # 样式
     def _apply_theme(self):
@@ -272,6 +1031,7 @@ class App:
         try:
             p = resource_path("logo.png")
             if not os.path.exists(p): return
+            from PIL import Image, ImageTk
             img = Image.open(p).convert("RGBA")
             w, h = img.size
             scale = min(1.0, LOGO_MAX_PX / max(w, h))
@@ -285,21 +1045,44 @@ class App:
     # 日志
     def _log(self, msg):
         ts = time.strftime("%H:%M:%S")
-        line = f"[{ts}] {msg}"
-        self.log.insert("end", line + "\n")
-        self.log.see("end")
-        try:
-            Path(self.log_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
-        except Exception:
-            pass
+        tag = getattr(self._tls, "tag", None)
+        line = f"[{ts}] [{tag}] {msg}" if tag else f"[{ts}] {msg}"
+        self._log_q.put(line)
+        path = getattr(self._tls, "log_path", None) or self.log_path
+        with self._log_lock:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except Exception:
+                pass
+
+    def _drain_log(self):
+        """主线程定时把排队的日志行写入窗口、执行 _in_ui 投递的回调（工作线程不直接碰 Tk）。"""
+        lines = []
+        def flush():
+            if lines:
+                self.log.insert("end", "\n".join(lines) + "\n"); self.log.see("end"); lines.clear()
+        while True:
+            try: item = self._log_q.get_nowait()
+            except queue.Empty: break
+            if not callable(item):
+                lines.append(item); continue
+            flush()
+            try: item()
+            except Exception as e: lines.append(f"界面更新失败：{e}")
+        flush()
+        self.root.after(LOG_UI_MS, self._drain_log)
+
+    def _in_ui(self, fn, *args):
+        """工作线程请求在主线程执行 fn(*args)，与日志行按顺序处理。"""
+        self._log_q.put(lambda: fn(*args))
 
     def _warn(self, msg, kind=None, danghao=None, detail=None):
         """高亮日志，并可顺便把该条写入核查清单。"""
         self._log(f"!!! {msg}")
         if kind and danghao:
-            self.check_items.append({"类别": kind, "档号": danghao, "原因": msg, "详情/路径": detail or ""})
+            getattr(self._tls, "check_items", self.check_items).append({"类别": kind, "档号": danghao, "原因": msg, "详情/路径": detail or ""})
 
     def open_log_file(self):
         p = self.log_path
@@ -342,25 +1125,257 @@ class App:
         else: messagebox.showinfo("提示", "请先选择有效目录。")
 
     # 执行
-    def run(self, do_copy: bool, do_pdf: bool):
+    def _form_job(self, do_copy: bool, do_pdf: bool):
+        """校验表单并生成任务参数；不完整时提示并返回 None。"""
         if not self.excel_path.get().strip():  return messagebox.showwarning("提示", "请先选择 Excel。")
         if not self.image_root.get().strip():  return messagebox.showwarning("提示", "请先选择 原图像根目录。")
         if do_pdf and not self.output_pdf_dir.get().strip():  return messagebox.showwarning("提示", "请选择 PDF 输出目录。")
         if do_copy and not self.copy_target_dir.get().strip(): return messagebox.showwarning("提示", "请选择 图片复制目录。")
         if not do_copy and not do_pdf:         return messagebox.showwarning("提示", "请至少选择一项操作。")
+        return {
+            "excel": self.excel_path.get().strip(), "img_root": self.image_root.get().strip(),
+            "pdf_out": self.output_pdf_dir.get().strip(), "copy_out": self.copy_target_dir.get().strip(),
+            "do_copy": do_copy, "do_pdf": do_pdf, "linearize": bool(self.pdf_linearize.get()),
+            "tesseract": self.tesseract_path.get().strip(),
+        }
+
+    def run(self, do_copy: bool, do_pdf: bool):
+        job = self._form_job(do_copy, do_pdf)
+        if job is None: return
 
-        if self.tesseract_path.get().strip(): _apply_tesseract(self.tesseract_path.get().strip())
+        if job["tesseract"]: _apply_tesseract(job["tesseract"])
         if do_pdf and not _tess_ready():
             return messagebox.showerror("错误", "未检测到可用的 Tesseract 或 tessdata。\n请确认安装并选择正确的 tesseract.exe（同级需有 tessdata）。")
 
         for b in (self.btn_both, self.btn_copy, self.btn_pdf): b.config(state="disabled")
-        self.log_path = prepare_log_file(); self.log_path_var.set(self.log_path)
+        # 日志文件随任务走（job["log_path"]）；self.log_path 只是界面显示 / 非任务日志的去处，运行中的任务不受影响
+        job["log_path"] = self.log_path = prepare_log_file(); self.log_path_var.set(self.log_path)
         self._log("=== 新任务开始 ===")
-        self._set_total(0, 1); self._set_item(0, 1)
+        prog = self._show_progress()
+
+        threading.Thread(target=self._worker, args=(job, prog), kwargs={"interactive": True}, daemon=True).start()
+
+    def _shared(self) -> dict:
+        """并发调度器、OCR/复制线程池、目录索引：首次使用时创建，此后所有任务（含队列）共用。"""
+        with self._res_lock:
+            if self._res is None:
+                gov = ResourceGovernor(log=self._log)
+                self._res = {
+                    "gov": gov,
+                    "ocr_pool":  ThreadPoolExecutor(max_workers=gov.max_workers("ocr"),  thread_name_prefix="ocr"),
+                    "copy_pool": ThreadPoolExecutor(max_workers=gov.max_workers("copy"), thread_name_prefix="copy"),
+                    "norm_pool": None,
+                    "index": FolderIndex(),
+                }
+            return self._res
+
+    def _norm_pool(self):
+        """格式转换进程池：只有遇到非 JPG 页时才启动。"""
+        res = self._shared()
+        with self._res_lock:
+            if res["norm_pool"] is None:
+                res["norm_pool"] = ProcessPoolExecutor(max_workers=NORM_WORKERS)
+            return res["norm_pool"]
+
+    # 任务队列
+    def open_queue(self):
+        if self._queue_win is not None and self._queue_win.winfo_exists():
+            self._queue_win.lift(); return
+        win = self._queue_win = tk.Toplevel(self.root)
+        win.title("任务队列"); win.geometry("900x420"); win.configure(bg=THEME_BG)
+
+        top = tk.Frame(win, bg=THEME_BG); top.pack(fill="x", padx=10, pady=(10, 6))
+        tk.Label(top, text="模式：", bg=THEME_BG, fg=THEME_FG).pack(side="left")
+        mode = tk.StringVar(value=next(iter(JOB_MODES)))
+        ttk.Combobox(top, textvariable=mode, values=list(JOB_MODES), state="readonly", width=14)\
+            .pack(side="left", padx=(0, 6))
+        ttk.Button(top, text="按当前表单加入队列", command=lambda: self.enqueue(mode.get())).pack(side="left")
+        tk.Label(top, text="并行任务数：", bg=THEME_BG, fg=THEME_FG).pack(side="left", padx=(18, 0))
+        par = tk.IntVar(value=self._parallel)
+        def set_parallel(*_):
+            # 变量写入即生效：箭头、手动输入都会触发；输入到一半（空 / 非数字）时保持原值
+            try: n = par.get()
+            except (tk.TclError, ValueError): return
+            with self._queue_cond:
+                self._parallel = max(1, min(JOB_PARALLEL[1], n))
+                self._queue_cond.notify_all()
+        par.trace_add("write", set_parallel)
+        ttk.Spinbox(top, from_=1, to=JOB_PARALLEL[1], textvariable=par, width=4).pack(side="left")
+        ttk.Button(top, text="开始队列", style="Primary.TButton", command=self.start_queue).pack(side="right")
+
+        cols = ("id", "状态", "模式", "Excel", "原图像根目录", "进度", "结果")
+        tree = ttk.Treeview(win, columns=cols, show="headings", selectmode="browse")
+        for c, w in zip(cols, (60, 70, 110, 220, 220, 80, 200)):
+            tree.heading(c, text=c); tree.column(c, width=w, anchor="w")
+        tree.pack(fill="both", expand=True, padx=10)
+
+        ops = tk.Frame(win, bg=THEME_BG); ops.pack(fill="x", padx=10, pady=8)
+        def on_sel(fn):
+            sel = tree.selection()
+            if sel: fn(sel[0])
+        for text, fn in (("置顶", lambda i: self.queue.move(i, -len(self.queue.jobs))),
+                         ("上移", lambda i: self.queue.move(i, -1)),
+                         ("下移", lambda i: self.queue.move(i, 1)),
+                         ("暂停/继续", self.toggle_pause),
+                         ("取消", self.cancel_job),
+                         ("删除", self.remove_job)):
+            ttk.Button(ops, text=text, command=lambda fn=fn: on_sel(fn)).pack(side="left", padx=4)
+
+        def refresh():
+            if not win.winfo_exists(): return
+            rows = self.queue.snapshot()
+            for iid in set(tree.get_children()) - {j["id"] for j in rows}:
+                tree.delete(iid)
+            for k, j in enumerate(rows):
+                mode_txt = next(m for m, v in JOB_MODES.items() if v == (j["do_copy"], j["do_pdf"]))
+                prog = self._running.get(j["id"], (None, None))[1]
+                prog_txt = f"{prog.volumes_done}/{prog.volumes_total}" if prog else ""
+                vals = (j["id"], j["status"], mode_txt, j["excel"], j["img_root"], prog_txt,
+                        j.get("summary", "").replace("\n", " "))
+                if tree.exists(j["id"]): tree.item(j["id"], values=vals); tree.move(j["id"], "", k)
+                else: tree.insert("", k, iid=j["id"], values=vals)
+            win.after(500, refresh)
+        refresh()
+
+    def enqueue(self, mode: str):
+        do_copy, do_pdf = JOB_MODES[mode]
+        job = self._form_job(do_copy, do_pdf)
+        if job is None: return
+        job = self.queue.add(**job)
+        self._log(f"已加入队列：{job['id']}（{mode}）{job['excel']}")
+
+    def toggle_pause(self, job_id):
+        job = self.queue.get(job_id)
+        ctl = self._running.get(job_id, (None, None))[0]
+        if job is None: return
+        if job["status"] == "运行中" and ctl:
+            ctl["resume"].clear(); self.queue.set_status(job_id, "暂停")
+            self._log(f"⏸ {job_id} 将在当前档号完成后暂停")
+        elif job["status"] == "暂停":
+            if ctl:
+                ctl["resume"].set(); self.queue.set_status(job_id, "运行中")
+            else:
+                self.queue.set_status(job_id, "等待")
+            self._log(f"▶ {job_id} 已继续")
+        elif job["status"] == "等待":
+            self.queue.set_status(job_id, "暂停")
+
+    def remove_job(self, job_id):
+        # 已开始执行的任务（含暂停中）不能删：工作线程还在等它的控制事件，删了就无法继续或取消
+        with self._queue_cond:
+            if job_id in self._running:
+                return self._log(f"{job_id} 正在执行，请先取消，结束后再删除")
+            self.queue.remove(job_id)
+
+    def cancel_job(self, job_id):
+        job = self.queue.get(job_id)
+        ctl = self._running.get(job_id, (None, None))[0]
+        if ctl:
+            ctl["cancel"].set(); ctl["resume"].set()
+            self._log(f"⏹ {job_id} 将在当前档号完成后取消")
+        elif job and job["status"] not in JobQueue.FINISHED:
+            self.queue.set_status(job_id, "已取消")
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+
+    def start_queue(self):
+        with self._queue_cond:
+            if self._queue_thread is not None:
+                return self._log("队列已在运行中。")
+            log_path = self.log_path = prepare_log_file(); self.log_path_var.set(log_path)
+            self._queue_thread = threading.Thread(target=self._queue_loop, args=(log_path,), daemon=True)
+            self._queue_thread.start()
+
+    def _queue_loop(self, log_path):
+        """按队列顺序取任务，最多同时运行 self._parallel 个；队列空且无运行中任务时退出。本轮任务共用 log_path。"""
+        self._tls.log_path = log_path
+        self._log("=== 队列开始 ===")
+        while True:
+            with self._queue_cond:
+                if len(self._running) >= self._parallel:
+                    self._queue_cond.wait(1.0); continue
+                job = self.queue.take_next()       # 副本，加字段不会写回 job_queue.json
+                if job is None:
+                    if not self._running:
+                        self._queue_thread = None
+                        break
+                    self._queue_cond.wait(1.0); continue
+                job["log_path"] = log_path
+                ctl = {"resume": threading.Event(), "cancel": threading.Event()}
+                ctl["resume"].set()
+                prog = ProgressReporter(); prog.start(0)
+                self._running[job["id"]] = (ctl, prog)
+            threading.Thread(target=self._run_job, args=(job, ctl, prog), daemon=True).start()
+        self._log("=== 队列结束 ===")
+
+    def _run_job(self, job, ctl, prog):
+        self._tls.log_path = job["log_path"]
+        self._log(f"▶▶ 队列任务 {job['id']} 开始：{job['excel']}")
+        self._in_ui(self._show_progress, prog)
+        try:
+            if job.get("tesseract"): _apply_tesseract(job["tesseract"])
+            if job["do_pdf"] and not _tess_ready():
+                status, summary = "失败", "Tesseract 未就绪"
+            else:
+                status, summary = self._worker(job, prog, ctl=ctl)
+        except Exception as e:
+            status, summary = "失败", str(e)
+        try:
+            self.queue.set_status(job["id"], status, summary=summary,
+                                  finished=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            self._log(f"■■ 队列任务 {job['id']} {status}")
+        finally:
+            # 无论如何都要释放并行名额，否则队列永远等不到“队列结束”
+            with self._queue_cond:
+                self._running.pop(job["id"], None)
+                self._queue_cond.notify_all()
 
-        threading.Thread(target=self._worker, args=(do_copy, do_pdf), daemon=True).start()
+    # 预估
+    def plan(self):
+        if not self.excel_path.get().strip():  return messagebox.showwarning("提示", "请先选择 Excel。")
+        if not self.image_root.get().strip():  return messagebox.showwarning("提示", "请先选择 原图像根目录。")
+        self.btn_plan.config(state="disabled")
+        threading.Thread(target=self._plan_worker, daemon=True).start()
+
+    def _plan_worker(self):
+        try:
+            t0 = time.perf_counter()
+            plan = plan_workload(self.excel_path.get().strip(), self.image_root.get().strip(),
+                                 self.output_pdf_dir.get().strip(), self.copy_target_dir.get().strip(),
+                                 index=self._shared()["index"])
+            stats = load_perf_stats()
+            est = estimate_seconds(plan, stats)
+            basis = (f"本机历史 {stats['runs']} 次运行" if stats["runs"] else "默认速度（本机尚无运行记录）")
+            text = (
+                f"档号 {plan['volumes']} 个（无法处理 {plan['problems']} 个），选中 {plan['pages']} 页\n"
+                f"格式转换：待转换 {plan['norm_pages']} 页（TIFF/PNG/BMP → JPG，已缓存的不计）\n"
+                f"JPG：待复制 {plan['copy_files']} 张 / {_fmt_size(plan['copy_bytes'])}，已存在 {plan['copy_done']} 张\n"
+                f"PDF：待 OCR {plan['ocr_volumes']} 卷 / {plan['ocr_pages']} 页，已存在 {plan['pdf_done']} 卷\n\n"
+                f"预计耗时（{basis}）：\n"
+                f"  只复制图片：{_fmt_duration(est['copy'])}\n"
+                f"  只生成PDF：{_fmt_duration(est['pdf'])}\n"
+                f"  复制 + 生成PDF：{_fmt_duration(est['both'])}\n"
+            )
+            self._log("=== 预估（未执行） ===\n" + text + f"（预估用时 {time.perf_counter() - t0:.1f}s）")
+            messagebox.showinfo("预估结果", text)
+        except ValueError as ve:
+            messagebox.showerror("错误", str(ve))
+        except Exception as e:
+            self._warn(f"预估失败：{e}")
+            messagebox.showerror("异常", str(e))
+        finally:
+            self.btn_plan.config(state="normal")
 
     # 进度条
+    def _show_progress(self, prog=None):
+        """让主界面进度条跟随 prog（默认新建一个）；须在主线程调用。"""
+        if prog is None:
+            prog = ProgressReporter(); prog.start(0)
+        self._shown_progress = prog
+        self._set_total(0, 1); self._set_item(0, 1); self.rate_var.set("")
+        prog.bind_tk(self.root, lambda snap: prog is self._shown_progress and self._render_progress(snap))
+        return prog
+
     def _set_total(self, cur, total):
         self.pb_total["maximum"] = max(total, 1)
         self.pb_total["value"]   = min(cur, total)
@@ -371,35 +1386,67 @@ class App:
         self.pb_item["value"]   = min(cur, total)
         self.pb_item_val.set(f"{cur}/{total}")
 
+    def _render_progress(self, snap):
+        """由 ProgressReporter 在主线程定时调用。"""
+        self._set_total(snap["volumes_done"], snap["volumes_total"])
+        self._set_item(snap["item_done"], snap["item_total"])
+        if snap["pages_done"]:
+            self.rate_var.set(ProgressReporter.describe(snap))
+
     # 核心工作线程
-    def _worker(self, do_copy: bool, do_pdf: bool):
+    def _worker(self, job: dict, prog: ProgressReporter, ctl=None, interactive: bool = False):
+        """
+        执行一个任务（直接运行或队列）。ctl 为队列的暂停/取消事件，在档号之间检查。
+        interactive=True 时结束弹窗并自动打开核查清单；队列任务只写日志。
+        返回 (状态, 汇总文本)。
+        """
+        do_copy, do_pdf = job["do_copy"], job["do_pdf"]
         jpg_success = jpg_skipped = jpg_failed = 0
         pdf_success = pdf_skipped = pdf_failed = 0
+        t_start = time.perf_counter()
+        res = self._shared()
+        gov, index = res["gov"], res["index"]
+        ocr_pool, copy_pool = res["ocr_pool"], res["copy_pool"]
+        check_items = []
+        with self._res_lock:                # 期间只要有别的任务在跑，耗时就不能代表本机速度
+            for other in self._active_runs: other["overlap"] = True
+            run_state = {"overlap": bool(self._active_runs)}
+            self._active_runs.append(run_state)
+        self._tls.check_items, self._tls.tag = check_items, job.get("id")
+        log_path = self._tls.log_path = job.get("log_path") or self.log_path
+        status, summary = "完成", ""
+
+        perf = {"norm_secs": 0.0, "norm_pages": 0, "copy_secs": 0.0, "copy_bytes": 0, "ocr_secs": 0.0, "ocr_pages": 0, "asm_secs": 0.0, "asm_pages": 0}
 
         try:
-            df = pd.read_excel(self.excel_path.get().strip(), engine="openpyxl", dtype=str)
-
-            rng_col = None
-            for cand in ("结论文书的页码范围", "法律结论文书的页码范围"):
-                if cand in df.columns: rng_col = cand; break
-            if ("档号" not in df.columns) or (rng_col is None):
-                messagebox.showerror("错误", "Excel需包含列：‘档号’ 与 ‘结论文书的页码范围’（或旧名‘法律结论文书的页码范围’）")
-                return
-
-            df = df[["档号", rng_col]].dropna(subset=["档号"]).copy()
-            df = df.sort_values(by="档号", key=lambda s: s.map(natural_keys)).reset_index(drop=True)
-
-            img_root = self.image_root.get().strip()
-            pdf_out  = self.output_pdf_dir.get().strip()
-            copy_out = self.copy_target_dir.get().strip()
+            import pandas as pd
+            try:
+                df, rng_col = read_task_table(job["excel"])
+            except ValueError as ve:
+                self._warn(str(ve))
+                if interactive: messagebox.showerror("错误", str(ve))
+                return "失败", str(ve)
+
+            img_root = job["img_root"]
+            pdf_out  = job["pdf_out"]
+            copy_out = job["copy_out"]
             if do_pdf: Path(pdf_out).mkdir(parents=True, exist_ok=True)
             if do_copy: Path(copy_out).mkdir(parents=True, exist_ok=True)
 
-            total = len(df); done = 0
-            self._set_total(0, total)
+            total = len(df)
+            prog.start(total)
             self._log(f"开始处理（{'复制+PDF' if (do_copy and do_pdf) else ('仅复制' if do_copy else '仅PDF')}），共 {total} 个档号…")
+            self._log(f"⚙ 初始并发：{gov.describe()}")
 
             for _, row in df.iterrows():
+                if ctl is not None:
+                    if not ctl["resume"].is_set():
+                        self._log("⏸ 已暂停，等待继续…")
+                        ctl["resume"].wait()
+                    if ctl["cancel"].is_set():
+                        status = "已取消"
+                        self._log(f"⏹ 已取消，剩余 {total - prog.volumes_done} 个档号未处理")
+                        break
                 danghao = str(row["档号"]).strip()
                 rng_str = row[rng_col]
                 folder  = _norm(Path(img_root) / danghao)
@@ -408,35 +1455,54 @@ class App:
                     if do_pdf:
                         self._warn(f"档号目录不存在：{folder}", kind="PDF", danghao=danghao, detail=folder)
                     jpg_failed += int(do_copy); pdf_failed += int(do_pdf)
-                    done += 1; self._set_total(done, total); continue
+                    prog.volume_done(); continue
 
-                all_imgs = list_images_sorted(folder)
+                all_imgs = index.pages(folder)
                 if not all_imgs:
-                    self._warn(f"无 JPG 图片：{folder}", kind="JPG", danghao=danghao, detail=folder)
+                    self._warn(f"无图片（JPG/TIFF/PNG/BMP）：{folder}", kind="JPG", danghao=danghao, detail=folder)
                     if do_pdf:
-                        self._warn(f"无 JPG 图片：{folder}", kind="PDF", danghao=danghao, detail=folder)
+                        self._warn(f"无图片（JPG/TIFF/PNG/BMP）：{folder}", kind="PDF", danghao=danghao, detail=folder)
                     jpg_failed += int(do_copy); pdf_failed += int(do_pdf)
-                    done += 1; self._set_total(done, total); continue
+                    prog.volume_done(); continue
 
                 picks = parse_ranges(rng_str)
                 if not picks:
                     self._warn(f"页码范围为空", kind="JPG", danghao=danghao, detail=str(rng_str))
                     if do_pdf: self._warn(f"页码范围为空", kind="PDF", danghao=danghao, detail=str(rng_str))
                     jpg_failed += int(do_copy); pdf_failed += int(do_pdf)
-                    done += 1; self._set_total(done, total); continue
+                    prog.volume_done(); continue
 
                 valid_pages = [p for p in picks if 1 <= p <= len(all_imgs)]
                 if not valid_pages:
                     self._warn(f"页码越界（总 {len(all_imgs)} 张）", kind="JPG", danghao=danghao, detail=str(picks))
                     if do_pdf: self._warn(f"页码越界（总 {len(all_imgs)} 张）", kind="PDF", danghao=danghao, detail=str(picks))
                     jpg_failed += int(do_copy); pdf_failed += int(do_pdf)
-                    done += 1; self._set_total(done, total); continue
+                    prog.volume_done(); continue
 
-                targets = [all_imgs[p-1] for p in valid_pages]
+                refs = [all_imgs[p-1] for p in valid_pages]
                 self._log(f"▶ 处理：{danghao}  选页 {valid_pages}")
 
-                self._set_item(0, len(targets))
-                item_done = 0
+                # ---------- 非 JPG 页先转成 JPG（进程池，已是最新的跳过） ----------
+                if any(name for _, _, name in refs):
+                    t_phase = time.perf_counter()
+                    targets, converted, norm_errors = normalize_pages(folder, refs, self._norm_pool())
+                    if converted:
+                        perf["norm_secs"] += time.perf_counter() - t_phase; perf["norm_pages"] += converted
+                        self._log(f"🔄 格式转换：{converted} 页 → JPG（{time.perf_counter() - t_phase:.1f}s）")
+                    for src, e in norm_errors.items():
+                        self._warn(f"格式转换失败：{src} ({e})", kind="PDF" if do_pdf else "JPG", danghao=danghao, detail=src)
+                    if norm_errors:
+                        # 转换失败的页不再进入复制 / OCR，避免同一页重复记失败
+                        keep = [i for i, (src, _, _) in enumerate(refs) if src not in norm_errors]
+                        valid_pages = [valid_pages[i] for i in keep]
+                        targets = [targets[i] for i in keep]
+                        if not targets:
+                            jpg_failed += int(do_copy); pdf_failed += int(do_pdf)
+                            prog.volume_done(); continue
+                else:
+                    targets = [src for src, _, _ in refs]
+
+                prog.volume_started(len(targets))
 
                 # ---------- JPG：保留原文件名，不加序号 ----------
                 if do_copy:
@@ -444,19 +1510,25 @@ class App:
                     try:
                         copy_dir.mkdir(parents=True, exist_ok=True)
                         copied, skipped, errors = 0, 0, 0
-                        for src in targets:
+                        t_phase = time.perf_counter()
+                        futs = [copy_pool.submit(copy_image, src, copy_dir / os.path.basename(src), gov)
+                                for src in targets]
+                        for src, fut in zip(targets, futs):
+                            nbytes = 0
                             try:
-                                base = os.path.basename(src)
-                                dst = copy_dir / base
-                                if dst.exists():
+                                if fut.result():
+                                    copied += 1
+                                    nbytes = os.path.getsize(src)
+                                    perf["copy_bytes"] += nbytes
+                                else:
+                                    dst = copy_dir / os.path.basename(src)
                                     skipped += 1
                                     self._warn(f"JPG已存在，跳过：{dst}", kind="JPG", danghao=danghao, detail=str(dst))
-                                else:
-                                    shutil.copy2(src, dst)
-                                    copied += 1
                             except Exception as e:
                                 errors += 1
                                 self._warn(f"复制失败：{src} ({e})", kind="JPG", danghao=danghao, detail=str(src))
+                            if not do_pdf: prog.page_done(nbytes)   # 同时生成PDF时按 OCR 计页
+                        perf["copy_secs"] += time.perf_counter() - t_phase
                         if copied > 0:
                             jpg_success += 1
                             self._log(f"📷 复制完成：新增 {copied} 张，跳过 {skipped} 张，失败 {errors} 张 -> {copy_dir}")
@@ -470,29 +1542,31 @@ class App:
                         jpg_failed += 1
                         self._warn(f"创建JPG子目录失败：{copy_dir} ({e})", kind="JPG", danghao=danghao, detail=str(copy_dir))
 
-                # ---------- PDF：按档号建子目录；同名PDF跳过 ----------
-                if do_pdf and _tess_ready():
+                # ---------- PDF：按档号建子目录；同名PDF跳过（OCR 之前判断，与预估一致） ----------
+                out_path = Path(pdf_out) / danghao / f"{danghao}.pdf"
+                if do_pdf and out_path.exists():
+                    pdf_skipped += 1
+                    self._warn(f"PDF已存在，跳过生成：{out_path}（请核对检查）", kind="PDF", danghao=danghao, detail=str(out_path))
+                elif do_pdf and _tess_ready():
                     workdir = Path(tempfile.mkdtemp(prefix="ocrpdf_"))
                     part_pdfs = []
                     try:
-                        for p, img_path in zip(valid_pages, targets):
+                        t_phase = time.perf_counter()
+                        futs = [ocr_pool.submit(ocr_page_to_pdf, img_path, workdir / f"p_{p}.pdf", gov)
+                                for p, img_path in zip(valid_pages, targets)]
+                        for img_path, fut in zip(targets, futs):
                             try:
-                                with Image.open(img_path) as im:
-                                    if im.mode not in ("RGB", "L"):
-                                        im = im.convert("RGB")
-                                    pdf_bytes = pytesseract.image_to_pdf_or_hocr(
-                                        im, extension="pdf", lang=DEFAULT_LANG, config=CUR_TESSCFG
-                                    )
-                                out_page = workdir / f"p_{p}.pdf"
-                                with open(out_page, "wb") as f:
-                                    f.write(pdf_bytes)
-                                part_pdfs.append(str(out_page))
+                                part_pdfs.append(fut.result())
                             except Exception as e:
                                 self._warn(f"OCR失败：{img_path} ({e})", kind="PDF", danghao=danghao, detail=str(img_path))
-                            item_done += 1; self._set_item(item_done, len(targets))
+                            try: nbytes = os.path.getsize(img_path)
+                            except OSError: nbytes = 0
+                            prog.page_done(nbytes)
+                        perf["ocr_secs"] += time.perf_counter() - t_phase
+                        perf["ocr_pages"] += len(part_pdfs)
 
                         if part_pdfs:
-                            out_dir = Path(pdf_out) / danghao
+                            out_dir = out_path.parent
                             if not out_dir.exists():
                                 try:
                                     out_dir.mkdir(parents=True, exist_ok=True)
@@ -500,26 +1574,20 @@ class App:
                                 except Exception as ce:
                                     pdf_failed += 1
                                     self._warn(f"创建PDF子目录失败：{out_dir} ({ce})", kind="PDF", danghao=danghao, detail=str(out_dir))
-                                    done += 1; self._set_total(done, total)
+                                    prog.volume_done()
                                     shutil.rmtree(workdir, ignore_errors=True)
                                     continue
 
-                            out_path = out_dir / f"{danghao}.pdf"
-                            if out_path.exists():
-                                pdf_skipped += 1
-                                self._warn(f"PDF已存在，跳过生成：{out_path}（请核对检查）", kind="PDF", danghao=danghao, detail=str(out_path))
-                            else:
-                                merger = PdfMerger()
-                                for pth in part_pdfs: merger.append(pth)
-                                try:
-                                    with open(out_path, "wb") as f: merger.write(f)
-                                    pdf_success += 1
-                                    self._log(f"✅ 生成PDF：{out_path}")
-                                except Exception as we:
-                                    pdf_failed += 1
-                                    self._warn(f"写入PDF失败：{out_path} ({we})", kind="PDF", danghao=danghao, detail=str(out_path))
-                                finally:
-                                    merger.close()
+                            try:
+                                st = assemble_pdf(part_pdfs, out_path, linearize=job.get("linearize", False))
+                                pdf_success += 1
+                                perf["asm_secs"] += st["seconds"]; perf["asm_pages"] += st["pages"]
+                                self._log(f"✅ 生成PDF：{out_path}")
+                                self._log(f"🗜 组装（{st['engine']}）：{st['pages']} 页，去重资源 {st['merged']} 个，"
+                                          f"{_fmt_size(st['before'])} → {_fmt_size(st['after'])}，写入 {st['seconds']:.2f}s")
+                            except Exception as we:
+                                pdf_failed += 1
+                                self._warn(f"写入PDF失败：{out_path} ({we})", kind="PDF", danghao=danghao, detail=str(out_path))
                         else:
                             pdf_failed += 1
                             self._warn(f"没有成功的页可合并", kind="PDF", danghao=danghao, detail=str(valid_pages))
@@ -529,52 +1597,63 @@ class App:
                     pdf_failed += 1
                     self._warn("Tesseract 未就绪，无法生成PDF。", kind="PDF", danghao=danghao, detail="Tesseract not ready")
 
-                done += 1
-                self._set_total(done, total)
+                prog.volume_done()
 
             # ----------- 任务汇总 -----------
             summary = (
-                "=== 任务汇总（卷级） ===\n"
                 f"JPG：成功 {jpg_success} 卷；跳过 {jpg_skipped} 卷；失败 {jpg_failed} 卷\n"
                 f"PDF：成功 {pdf_success} 卷；跳过 {pdf_skipped} 卷；失败 {pdf_failed} 卷\n"
             )
-            self._log(summary)
-            messagebox.showinfo(
-                "运行结果",
-                f"JPG：成功 {jpg_success} 卷；跳过 {jpg_skipped} 卷；失败 {jpg_failed} 卷\n"
-                f"PDF：成功 {pdf_success} 卷；跳过 {pdf_skipped} 卷；失败 {pdf_failed} 卷\n\n"
-                f"详情见日志：\n{self.log_path}"
+            self._log(
+                "=== 任务汇总（卷级） ===\n" + summary +
+                f"耗时 {time.perf_counter() - t_start:.1f}s；结束时并发：{gov.describe()}\n"
             )
+            if run_state["overlap"]:
+                self._log("本次与其他任务并行运行，耗时不计入本机历史速度。")
+            else:
+                record_perf_stats(perf)
+            if interactive:
+                messagebox.showinfo("运行结果", summary + f"\n详情见日志：\n{log_path}")
 
             # ----------- 生成并打开“核查清单.xlsx” -----------
-            if self.check_items:
-                df_check = pd.DataFrame(self.check_items, columns=["类别", "档号", "原因", "详情/路径"])
-                check_path = self._make_checklist_path()
+            if check_items:
+                df_check = pd.DataFrame(check_items, columns=["类别", "档号", "原因", "详情/路径"])
+                check_path = self._make_checklist_path(log_path, job.get("id"))
                 try:
                     # Excel 2007 兼容 .xlsx
                     df_check.to_excel(check_path, index=False, engine="openpyxl", sheet_name="核查清单")
                     self._log(f"已生成核查清单：{check_path}")
-                    try:
-                        os.startfile(check_path)  # 弹窗后自动打开
-                    except Exception:
-                        pass
+                    if interactive:
+                        try:
+                            os.startfile(check_path)  # 弹窗后自动打开
+                        except Exception:
+                            pass
                 except Exception as e:
                     self._warn(f"生成核查清单失败：{check_path} ({e})")
 
         except Exception as e:
             self._warn(f"异常：{e}")
-            messagebox.showerror("异常", str(e))
+            if interactive: messagebox.showerror("异常", str(e))
+            status, summary = "失败", str(e)
         finally:
-            for b in (self.btn_both, self.btn_copy, self.btn_pdf): b.config(state="normal")
-
-    def _make_checklist_path(self) -> str:
-        """核查清单与日志放一起，命名 check_时间.xlsx"""
-        base = Path(self.log_path).parent
+            prog.finish()
+            with self._res_lock:
+                self._active_runs.remove(run_state)
+            self._tls.check_items, self._tls.tag = self.check_items, None
+            if interactive:
+                for b in (self.btn_both, self.btn_copy, self.btn_pdf): b.config(state="normal")
+        return status, summary
+
+    def _make_checklist_path(self, log_path, tag=None) -> str:
+        """核查清单与该任务的日志放一起，命名 check_时间.xlsx（队列任务加任务号）"""
+        base = Path(log_path).parent
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return _norm(base / f"check_{ts}.xlsx")
+        return _norm(base / (f"check_{ts}_{tag}.xlsx" if tag else f"check_{ts}.xlsx"))
 
 # ================== 入口 ==================
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()   # PyInstaller 单文件下的格式转换进程池需要
     try:
         import ctypes
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("com.jiangxun.judocmerge.v3312")